@@ -26,6 +26,7 @@ from botocore.exceptions import ClientError
 from helpers.event_transformer import CloudTrailTransformer
 from helpers.security_lake_client import SecurityLakeClient
 from helpers.json_fixer import fix_json
+from core.template_transformer import precompile_extractors, precompile_templates
 
 # Environment Variables - Loaded once at module level for better readability and performance
 LOGGING_LEVEL = os.getenv('LOGGING_LEVEL', 'INFO')
@@ -76,6 +77,13 @@ except Exception as e:
     logging.basicConfig(stream=sys.stdout, level=logging.INFO)
     logger = logging.getLogger(__name__)
 
+# Pre-compile template JSONPath extractors and Jinja2 templates during Lambda init (outside the handler)
+try:
+    precompile_extractors(logger=logger)
+    precompile_templates(logger=logger)
+except Exception as e:
+    logger.warning(f"Template pre-compilation failed, templates will compile on first use: {str(e)}")
+
 # Global variables for connection reuse and performance optimization
 transformer: Optional[CloudTrailTransformer] = None
 sqs_client: Optional[boto3.client] = None
@@ -11,7 +11,10 @@ Template driven Event Mapper for transforming cloud security events to other for
 import json
 import logging
 import os
-from typing import Dict, Any, List, Optional, Union
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Union, Callable, Tuple
 from datetime import datetime
 from core.cloudtrail_types import CloudTrailAuditEvent
 
@@ -23,6 +26,117 @@ except ImportError:
     TEMPLATE_TRANSFORMER_AVAILABLE = False
     TemplateTransformer = None
 
+# Mapping validation is only needed when the mapping file changes, so it is opt-in at runtime
+VALIDATE_MAPPINGS = os.getenv('VALIDATE_MAPPINGS', 'false').lower() == 'true'
+
+# Event type mappings live in mapping/ under the Lambda function root (one level up from core/)
+EVENT_TYPE_MAPPINGS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mapping', 'event_type_mappings.json'
+)
+
+# Matches a path segment with an array index (e.g., "records[0]")
+ARRAY_INDEX_PATTERN = re.compile(r'^(.+)\[(\d+)\]$')
+
+
+@dataclass(frozen=True)
+class EventTypePlan:
+    """Pre-compiled classification plan for a single event type mapping"""
+    name: str
+    detection_check: Optional[Callable[[Dict[str, Any]], bool]]
+    type_check: Optional[Callable[[Dict[str, Any]], bool]]
+    reason: str
+
+
+@lru_cache(maxsize=256)
+def _parse_key_path(key_path: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """
+    Parse a dot-separated key path into (key, array index) steps
+    
+    Args:
+        key_path: Dot-separated path with optional array indices (e.g., 'records[0].Type')
+        
+    Returns:
+        Tuple of (key, index) pairs where index is None for plain keys
+    """
+    steps = []
+    # Split by dots but preserve array indices
+    # e.g., "records[0].Type" -> ["records[0]", "Type"]
+    for key in key_path.split('.'):
+        array_match = ARRAY_INDEX_PATTERN.match(key)
+        if array_match:
+            steps.append((array_match.group(1), int(array_match.group(2))))
+        else:
+            steps.append((key, None))
+    return tuple(steps)
+
+
+def _resolve_key_path(data: Any, steps: Tuple[Tuple[str, Optional[int]], ...]) -> Any:
+    """
+    Walk pre-parsed key path steps through nested dictionaries and lists
+    
+    Args:
+        data: Dictionary to extract value from
+        steps: Steps returned by _parse_key_path
+        
+    Returns:
+        The value at the path, or empty string if not found
+    """
+    current = data
+    
+    for key, index in steps:
+        if not isinstance(current, dict):
+            return ''
+        current = current.get(key)
+        if current is None:
+            return ''
+        
+        if index is not None:
+            # Access the array element
+            if isinstance(current, list) and index < len(current):
+                current = current[index]
+            else:
+                return ''
+    
+    return current
+
+
+def _compile_key_path_getter(key_path: str) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Build a getter specialized for the shape of a key path
+    
+    One and two level paths without array indices (the common case in the event
+    type mappings) are resolved with direct dictionary lookups, other paths fall
+    back to walking the parsed steps.
+    
+    Args:
+        key_path: Dot-separated path with optional array indices
+        
+    Returns:
+        Callable returning the value at the path, or empty string if not found
+    """
+    steps = _parse_key_path(key_path)
+    
+    if len(steps) == 1 and steps[0][1] is None:
+        key = steps[0][0]
+        
+        def get_value(data: Dict[str, Any]) -> Any:
+            value = data.get(key) if isinstance(data, dict) else None
+            return '' if value is None else value
+    elif len(steps) == 2 and steps[0][1] is None and steps[1][1] is None:
+        parent_key, child_key = steps[0][0], steps[1][0]
+        
+        def get_value(data: Dict[str, Any]) -> Any:
+            parent = data.get(parent_key) if isinstance(data, dict) else None
+            if not isinstance(parent, dict):
+                return ''
+            value = parent.get(child_key)
+            return '' if value is None else value
+    else:
+        def get_value(data: Dict[str, Any]) -> Any:
+            return _resolve_key_path(data, steps)
+    
+    return get_value
+
 
 class CloudEventMapper:
     """
@@ -39,6 +153,7 @@ class CloudEventMapper:
         """
         self.logger = logger or logging.getLogger(__name__)
         self.event_type_mappings = self._load_event_type_mappings()
+        self._event_type_plans = self._compile_event_type_plans()
         self.use_templates = use_templates and TEMPLATE_TRANSFORMER_AVAILABLE
         
         # Initialize template transformer if available and requested
@@ -59,6 +174,9 @@ class CloudEventMapper:
                 self.logger.info("Template transformer not available, using legacy transformation methods")
             else:
                 self.logger.info("Template transformation disabled, using legacy transformation methods")
+        
+        # Resolve the transformation path once instead of checking feature flags per event
+        self._dispatch = self._dispatch_template if self.use_templates else self._dispatch_legacy
     
     def map_cloud_event_to_cloudtrail(self, cloud_event: Dict[str, Any], aws_account_id: str,
                                       output_format: str = 'cloudtrail') -> Optional[Union[CloudTrailAuditEvent, Dict[str, Any]]]:
@@ -74,50 +192,17 @@ class CloudEventMapper:
         Returns:
             CloudTrailAuditEvent for CloudTrail format, Dict for OCSF/ASFF formats, or None if mapping fails
         """
+        # Extract event_data once - shared by classification and error reporting
+        event_data = self._extract_event_data(cloud_event)
+        
         try:
-            event_type = self._determine_event_type(cloud_event)
-            self.logger.debug(f"Determined event type: {event_type}")
-            
-            # Try template-driven transformation first
-            if self.use_templates and self.template_transformer:
-                try:
-                    result = self.template_transformer.transform_event(
-                        cloud_event, aws_account_id, event_type, output_format=output_format
-                    )
-                    if result:
-                        self.logger.debug(f"Successfully transformed using template for {event_type} ({output_format})")
-                        return result
-                    else:
-                        self.logger.warning(f"Template transformation returned None for {event_type} ({output_format}), falling back to legacy")
-                except Exception as template_error:
-                    self.logger.warning(
-                        f"Template transformation failed for {event_type} ({output_format}): {str(template_error)}, falling back to legacy methods"
-                    )
+            event_type = self._classify_event_data(event_data)
+            self.logger.debug("Determined event type: %s", event_type)
             
-            # Fallback to legacy hardcoded transformation methods (only for cloudtrail format)
-            if output_format != 'cloudtrail':
-                self.logger.error(f"No template available for {event_type} with {output_format} format, and no legacy fallback exists")
-                return None
+            return self._dispatch(cloud_event, aws_account_id, event_type, output_format)
             
-            self.logger.debug(f"Using legacy transformation for {event_type}")
-            
-            if event_type == 'azure_security_alert':
-                return CloudTrailEventBuilder.build_from_azure_security_alert(
-                    cloud_event, aws_account_id
-                )
-            elif event_type == 'azure_secure_score':
-                return CloudTrailEventBuilder.build_from_azure_secure_score(
-                    cloud_event, aws_account_id
-                )
-            else:
-                # Use generic builder for all other types
-                return CloudTrailEventBuilder.build_generic_event(
-                    cloud_event, aws_account_id
-                )
-                
         except Exception as e:
             # Safe extraction for error logging
-            event_data = cloud_event.get('event_data', {})
             event_type = 'unknown'
             event_id = 'unknown'
             
@@ -139,6 +224,71 @@ class CloudEventMapper:
             )
             return None
     
+    def _dispatch_template(self, cloud_event: Dict[str, Any], aws_account_id: str, event_type: str,
+                           output_format: str) -> Optional[Union[CloudTrailAuditEvent, Dict[str, Any]]]:
+        """
+        Transform a classified event using its template, falling back to legacy methods on failure
+        
+        Args:
+            cloud_event: Raw cloud event data from SQS
+            aws_account_id: AWS account ID for the recipient
+            event_type: Event type determined for the cloud event
+            output_format: Output format - 'cloudtrail', 'ocsf', or 'asff'
+            
+        Returns:
+            Transformed event, or None if transformation fails
+        """
+        try:
+            result = self.template_transformer.transform_event(
+                cloud_event, aws_account_id, event_type, output_format=output_format
+            )
+            if result:
+                self.logger.debug("Successfully transformed using template for %s (%s)", event_type, output_format)
+                return result
+            else:
+                self.logger.warning(f"Template transformation returned None for {event_type} ({output_format}), falling back to legacy")
+        except Exception as template_error:
+            self.logger.warning(
+                f"Template transformation failed for {event_type} ({output_format}): {str(template_error)}, falling back to legacy methods"
+            )
+        
+        return self._dispatch_legacy(cloud_event, aws_account_id, event_type, output_format)
+    
+    def _dispatch_legacy(self, cloud_event: Dict[str, Any], aws_account_id: str, event_type: str,
+                         output_format: str) -> Optional[Union[CloudTrailAuditEvent, Dict[str, Any]]]:
+        """
+        Transform a classified event using legacy hardcoded transformation methods
+        
+        Args:
+            cloud_event: Raw cloud event data from SQS
+            aws_account_id: AWS account ID for the recipient
+            event_type: Event type determined for the cloud event
+            output_format: Output format - only 'cloudtrail' has a legacy implementation
+            
+        Returns:
+            CloudTrailAuditEvent, or None if no legacy method exists for the output format
+        """
+        # Legacy hardcoded transformation methods only exist for cloudtrail format
+        if output_format != 'cloudtrail':
+            self.logger.error(f"No template available for {event_type} with {output_format} format, and no legacy fallback exists")
+            return None
+        
+        self.logger.debug("Using legacy transformation for %s", event_type)
+        
+        if event_type == 'azure_security_alert':
+            return CloudTrailEventBuilder.build_from_azure_security_alert(
+                cloud_event, aws_account_id
+            )
+        elif event_type == 'azure_secure_score':
+            return CloudTrailEventBuilder.build_from_azure_secure_score(
+                cloud_event, aws_account_id
+            )
+        else:
+            # Use generic builder for all other types
+            return CloudTrailEventBuilder.build_generic_event(
+                cloud_event, aws_account_id
+            )
+    
     def map_cloud_events_batch(self, cloud_events: List[Dict[str, Any]],
                               aws_account_id: str) -> List[CloudTrailAuditEvent]:
         """
@@ -155,19 +305,25 @@ class CloudEventMapper:
         successful_mappings = 0
         failed_mappings = 0
         
+        # Bind per-event lookups to locals for the batch loop
+        map_event = self.map_cloud_event_to_cloudtrail
+        append_event = cloudtrail_events.append
+        log_warning = self.logger.warning
+        log_error = self.logger.error
+        
         for i, cloud_event in enumerate(cloud_events):
             try:
-                cloudtrail_event = self.map_cloud_event_to_cloudtrail(cloud_event, aws_account_id)
+                cloudtrail_event = map_event(cloud_event, aws_account_id)
                 if cloudtrail_event:
-                    cloudtrail_events.append(cloudtrail_event)
+                    append_event(cloudtrail_event)
                     successful_mappings += 1
                 else:
                     failed_mappings += 1
-                    self.logger.warning(f"Failed to map cloud event {i}")
+                    log_warning("Failed to map cloud event %d", i)
                     
             except Exception as e:
                 failed_mappings += 1
-                self.logger.error(
+                log_error(
                     f"Error mapping cloud event {i}",
                     extra={'error': str(e)}
                 )
@@ -183,6 +339,139 @@ class CloudEventMapper:
         
         return cloudtrail_events
     
+    def _compile_event_type_plans(self) -> List[EventTypePlan]:
+        """
+        Compile event type mappings into an ordered list of classification plans
+        
+        Mappings are sorted by specificity once (detection_keys first, then by
+        event_type_value length) and their key paths are pre-parsed, so classifying
+        an event only evaluates the compiled matchers. Mappings with identical
+        detection_keys share a single detection check so it is evaluated once per event.
+        
+        Returns:
+            Ordered list of classification plans (generic mapping excluded)
+        """
+        # Sort mappings by specificity (check detection_keys first, then by event_type_value length)
+        sorted_mappings = sorted(
+            [(k, v) for k, v in self.event_type_mappings.items() if k != 'generic'],
+            key=lambda x: (
+                len(x[1].get('detection_keys', [])) > 0,  # Prioritize detection_keys
+                len(x[1].get('event_type_value', '')) if x[1].get('event_type_value') else 0
+            ),
+            reverse=True
+        )
+        
+        plans = []
+        detection_checks = {}
+        for mapping_name, mapping_config in sorted_mappings:
+            plan = self._compile_event_type_plan(mapping_name, mapping_config, detection_checks)
+            if plan:
+                plans.append(plan)
+        
+        return plans
+    
+    def _compile_event_type_plan(self, mapping_name: str, mapping_config: Dict[str, Any],
+                                 detection_checks: Dict[Tuple[str, ...], Callable[[Dict[str, Any]], bool]]) -> Optional[EventTypePlan]:
+        """
+        Compile a single event type mapping into a classification plan
+        
+        Args:
+            mapping_name: Name of the event type mapping
+            mapping_config: Mapping configuration
+            detection_checks: Detection checks already compiled, keyed by detection_keys
+            
+        Returns:
+            EventTypePlan, or None if the mapping can never match
+        """
+        detection_keys = mapping_config.get('detection_keys') or []
+        event_type_key = mapping_config.get('event_type_key')
+        expected_value = mapping_config.get('event_type_value')
+        match_mode = mapping_config.get('event_type_match_mode', 'contains')
+        has_event_type = bool(event_type_key and expected_value)
+        
+        keys_present = None
+        if detection_keys:
+            detection_id = tuple(detection_keys)
+            if detection_id not in detection_checks:
+                detection_checks[detection_id] = self._compile_detection_check(detection_keys)
+            keys_present = detection_checks[detection_id]
+        type_matches = None
+        if has_event_type:
+            type_matches = self._compile_event_type_check(event_type_key, expected_value, match_mode)
+            if type_matches is None:
+                self.logger.warning(f"Unsupported event_type_match_mode '{match_mode}' for {mapping_name}, mapping disabled")
+                return None
+        
+        # Case 1: Both detection_keys AND event_type matching configured - require BOTH to match
+        if keys_present and type_matches:
+            reason = 'detection keys + event_type match'
+        # Case 2: Only detection_keys configured (no event_type matching) - require detection_keys to match
+        elif keys_present:
+            reason = f"detection keys only match: {detection_keys}"
+        # Case 3: Only event_type matching configured (no detection_keys) - require event_type to match
+        elif type_matches:
+            reason = 'event_type only match'
+        else:
+            return None
+        
+        return EventTypePlan(name=mapping_name, detection_check=keys_present,
+                             type_check=type_matches, reason=reason)
+    
+    @staticmethod
+    def _compile_detection_check(detection_keys: List[str]) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Build a matcher that checks ALL detection keys are present (supports nested paths with dots)
+        
+        Args:
+            detection_keys: Detection keys from the mapping configuration
+            
+        Returns:
+            Callable returning True when every detection key is present in event_data
+        """
+        simple_keys = tuple(key for key in detection_keys if '.' not in key)
+        nested_getters = tuple(_compile_key_path_getter(key) for key in detection_keys if '.' in key)
+        
+        def keys_present(event_data: Dict[str, Any]) -> bool:
+            for key in simple_keys:
+                if key not in event_data:
+                    return False
+            for get_value in nested_getters:
+                value = get_value(event_data)
+                if value is None or value == '':
+                    return False
+            return True
+        
+        return keys_present
+    
+    @staticmethod
+    def _compile_event_type_check(event_type_key: str, expected_value: str,
+                                  match_mode: str) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        """
+        Build a matcher for the configured event type key/value and match mode
+        
+        Contains/startswith use case-insensitive matching since Azure resourceIds are uppercase.
+        
+        Args:
+            event_type_key: Dot-separated path of the field to compare
+            expected_value: Expected value from the mapping configuration
+            match_mode: One of 'contains', 'exact', 'nested_exact' or 'startswith'
+            
+        Returns:
+            Callable returning True when the event type matches, or None for unsupported modes
+        """
+        get_value = _compile_key_path_getter(event_type_key)
+        
+        if match_mode == 'contains':
+            expected_lower = expected_value.lower()
+            return lambda event_data: expected_lower in str(get_value(event_data)).lower()
+        elif match_mode == 'exact' or match_mode == 'nested_exact':
+            return lambda event_data: expected_value == str(get_value(event_data))
+        elif match_mode == 'startswith':
+            expected_lower = expected_value.lower()
+            return lambda event_data: str(get_value(event_data)).lower().startswith(expected_lower)
+        
+        return None
+    
     def _determine_event_type(self, cloud_event: Dict[str, Any]) -> str:
         """
         Determine the type of cloud event for proper mapping using the event type mappings configuration
@@ -193,6 +482,18 @@ class CloudEventMapper:
         Returns:
             Event type string
         """
+        return self._classify_event_data(self._extract_event_data(cloud_event))
+    
+    def _extract_event_data(self, cloud_event: Dict[str, Any]) -> Any:
+        """
+        Extract the event payload used for classification from a cloud event
+        
+        Args:
+            cloud_event: Cloud event data (Azure, GCP, etc.)
+            
+        Returns:
+            The event_data payload (not guaranteed to be a dictionary)
+        """
         # Try event_data first (common format)
         event_data = cloud_event.get('event_data', {})
         
@@ -202,90 +503,48 @@ class CloudEventMapper:
             # For GCP VPC Flow Logs: data contains event_data wrapper
             if isinstance(data, dict) and 'event_data' in data:
                 event_data = data['event_data']
-                self.logger.debug(f"DIAGNOSTIC: Using data.event_data for GCP VPC Flow Logs")
+                self.logger.debug("DIAGNOSTIC: Using data.event_data for GCP VPC Flow Logs")
             else:
                 event_data = data
         
+        return event_data
+    
+    def _classify_event_data(self, event_data: Any) -> str:
+        """
+        Classify an extracted event payload using the compiled event type plans
+        
+        Args:
+            event_data: Event payload returned by _extract_event_data
+            
+        Returns:
+            Event type string
+        """
         # Ensure event_data is a dictionary
         if not isinstance(event_data, dict):
             self.logger.warning(f"event_data is not a dictionary: {type(event_data)}")
             return 'generic'
         
-        self.logger.debug(f"DIAGNOSTIC: Event data keys: {list(event_data.keys())}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("DIAGNOSTIC: Event data keys: %s", list(event_data.keys()))
         
-        # Sort mappings by specificity (check detection_keys first, then by event_type_value length)
-        sorted_mappings = sorted(
-            [(k, v) for k, v in self.event_type_mappings.items() if k != 'generic'],
-            key=lambda x: (
-                len(x[1].get('detection_keys', [])) > 0,  # Prioritize detection_keys
-                len(x[1].get('event_type_value', '')) if x[1].get('event_type_value') else 0
-            ),
-            reverse=True
-        )
-        
-        # Iterate through sorted mappings to find a match
-        for mapping_name, mapping_config in sorted_mappings:
-            # Check if this mapping has detection_keys
-            has_detection_keys = 'detection_keys' in mapping_config and mapping_config['detection_keys']
-            all_keys_present = False
-            
-            if has_detection_keys:
-                detection_keys = mapping_config['detection_keys']
-                # Check if ALL detection keys are present (supports nested paths with dots)
-                all_keys_present = True
-                for key in detection_keys:
-                    if '.' in key:
-                        # Nested key - use _get_nested_value
-                        value = self._get_nested_value(event_data, key)
-                        if value is None or value == '':
-                            all_keys_present = False
-                            break
-                    else:
-                        # Simple key - direct check
-                        if key not in event_data:
-                            all_keys_present = False
-                            break
-            
-            # Check event type matching
-            event_type_key = mapping_config.get('event_type_key')
-            expected_value = mapping_config.get('event_type_value')
-            match_mode = mapping_config.get('event_type_match_mode', 'contains')
-            
-            # Get the actual value from event_data (support nested fields with dot notation)
-            actual_value = self._get_nested_value(event_data, event_type_key) if event_type_key else ''
+        # Plans are pre-sorted by specificity at init - first match wins
+        # Shared detection checks are evaluated at most once per event
+        detection_results = {}
+        for plan in self._event_type_plans:
+            detection_check = plan.detection_check
+            if detection_check is not None:
+                keys_present = detection_results.get(detection_check)
+                if keys_present is None:
+                    keys_present = detection_results[detection_check] = detection_check(event_data)
+                if not keys_present:
+                    continue
             
-            # Check if event_type_value matches
-            event_type_matches = False
-            if event_type_key and expected_value:
-                self.logger.debug(f"DIAGNOSTIC: Checking {mapping_name}: key={event_type_key}, expected={expected_value}, actual={actual_value}, mode={match_mode}")
-                
-                # Apply match mode (use case-insensitive matching for contains/startswith since Azure resourceIds are uppercase)
-                if match_mode == 'contains':
-                    event_type_matches = expected_value.lower() in str(actual_value).lower()
-                elif match_mode == 'exact' or match_mode == 'nested_exact':
-                    event_type_matches = expected_value == str(actual_value)
-                elif match_mode == 'startswith':
-                    event_type_matches = str(actual_value).lower().startswith(expected_value.lower())
-            
-            # Determine if this mapping matches based on what criteria are configured
-            # Case 1: Both detection_keys AND event_type matching configured - require BOTH to match
-            if has_detection_keys and event_type_key and expected_value:
-                if all_keys_present and event_type_matches:
-                    self.logger.debug(f"DIAGNOSTIC: Classified as {mapping_name} (detection keys + event_type match)")
-                    return mapping_name
-            # Case 2: Only detection_keys configured (no event_type matching) - require detection_keys to match
-            elif has_detection_keys and (not event_type_key or not expected_value):
-                if all_keys_present:
-                    self.logger.debug(f"DIAGNOSTIC: Classified as {mapping_name} (detection keys only match: {mapping_config['detection_keys']})")
-                    return mapping_name
-            # Case 3: Only event_type matching configured (no detection_keys) - require event_type to match
-            elif not has_detection_keys and event_type_key and expected_value:
-                if event_type_matches:
-                    self.logger.debug(f"DIAGNOSTIC: Classified as {mapping_name} (event_type only match)")
-                    return mapping_name
+            if plan.type_check is None or plan.type_check(event_data):
+                self.logger.debug("DIAGNOSTIC: Classified as %s (%s)", plan.name, plan.reason)
+                return plan.name
         
         # Default to generic mapping
-        self.logger.debug(f"DIAGNOSTIC: Classified as generic (no specific match found)")
+        self.logger.debug("DIAGNOSTIC: Classified as generic (no specific match found)")
         return 'generic'
     
     def _get_nested_value(self, data: Dict[str, Any], key_path: str) -> Any:
@@ -302,49 +561,7 @@ class CloudEventMapper:
         if not key_path:
             return ''
         
-        # Parse the key path to handle array indices
-        import re
-        
-        # Split by dots but preserve array indices
-        # e.g., "records[0].Type" -> ["records[0]", "Type"]
-        keys = key_path.split('.')
-        current = data
-        
-        for key in keys:
-            # Check if this key has an array index (e.g., "records[0]")
-            array_match = re.match(r'^(.+)\[(\d+)\]$', key)
-            
-            if array_match:
-                # Extract the base key and index
-                base_key = array_match.group(1)
-                index = int(array_match.group(2))
-                
-                # Navigate to the array
-                if isinstance(current, dict):
-                    current = current.get(base_key)
-                    if current is None:
-                        return ''
-                else:
-                    return ''
-                
-                # Access the array element
-                if isinstance(current, list):
-                    if index < len(current):
-                        current = current[index]
-                    else:
-                        return ''
-                else:
-                    return ''
-            else:
-                # Simple key access
-                if isinstance(current, dict):
-                    current = current.get(key)
-                    if current is None:
-                        return ''
-                else:
-                    return ''
-        
-        return current
+        return _resolve_key_path(data, _parse_key_path(key_path))
     
     def _load_event_type_mappings(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -358,18 +575,25 @@ class CloudEventMapper:
         default_mappings = {}
         
         try:
-            # Get the Lambda function root directory (go up from core/ to function root)
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            function_root = os.path.dirname(current_dir)  # Go up one level from core/
-            config_file_path = os.path.join(function_root, 'mapping', 'event_type_mappings.json')
+            config_file_path = EVENT_TYPE_MAPPINGS_PATH
             
             # Check if the config file exists
             if os.path.exists(config_file_path):
                 with open(config_file_path, 'r', encoding='utf-8') as f:
                     loaded_mappings = json.load(f)
                 
-                # Validate that loaded mappings have required fields
-                if self._validate_mappings(loaded_mappings):
+                if not isinstance(loaded_mappings, dict):
+                    self.logger.warning("Mappings is not a dictionary, using default mappings")
+                    return default_mappings
+                
+                # Always reject non-dict entries - plan compilation requires every mapping to be a dict
+                for event_type, mapping in loaded_mappings.items():
+                    if not isinstance(mapping, dict):
+                        self.logger.warning(f"Mapping for {event_type} is not a dictionary, using default mappings")
+                        return default_mappings
+                
+                # Validate that loaded mappings have required fields (only if VALIDATE_MAPPINGS is true)
+                if not VALIDATE_MAPPINGS or self._validate_mappings(loaded_mappings):
                     self.logger.info(f"Successfully loaded event type mappings from {config_file_path}")
                     return loaded_mappings
                 else:
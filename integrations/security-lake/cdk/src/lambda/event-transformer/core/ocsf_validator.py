@@ -3,24 +3,87 @@ OCSF Schema Validation Utility
 Validates OCSF events against schema definitions using metaschema rules
 """
 
-import json
+import ipaddress
+import os
 import re
+import time
 import logging
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
+from collections import Counter
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from datetime import datetime, timezone
+
+# Try to import google-re2 for linear-time pattern matching - gracefully handle if not available
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+    re2 = None
+
+# Regex engine for OCSF data type patterns: 're' (default) or 're2' (requires google-re2)
+USE_RE2 = RE2_AVAILABLE and os.getenv('OCSF_REGEX_ENGINE', 're').lower() == 're2'
 
 # Data type validation patterns from OCSF schema
-OCSF_DATA_TYPE_PATTERNS = {
+_OCSF_DATA_TYPE_REGEX_SOURCES = {
     'email_t': r'^[a-zA-Z0-9!#$%&\'*+-/=?^_`{|}~.]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$',
     'file_hash_t': r'^[a-fA-F0-9]+$',
     'hostname_t': r'^[a-zA-Z0-9.-]+$',
-    'ip_t': r'((^\s*((([0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]).){3}([0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))\s*$)|(^\s*((([0-9A-Fa-f]{1,4}:){7}([0-9A-Fa-f]{1,4}|:))|(([0-9A-Fa-f]{1,4}:){6}(:[0-9A-Fa-f]{1,4}|((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3})|:))|(([0-9A-Fa-f]{1,4}:){5}(((:[0-9A-Fa-f]{1,4}){1,2})|:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3})|:))|(([0-9A-Fa-f]{1,4}:){4}(((:[0-9A-Fa-f]{1,4}){1,3})|((:[0-9A-Fa-f]{1,4})?:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(([0-9A-Fa-f]{1,4}:){3}(((:[0-9A-Fa-f]{1,4}){1,4})|((:[0-9A-Fa-f]{1,4}){0,2}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(([0-9A-Fa-f]{1,4}:){2}(((:[0-9A-Fa-f]{1,4}){1,5})|((:[0-9A-Fa-f]{1,4}){0,3}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(([0-9A-Fa-f]{1,4}:){1}(((:[0-9A-Fa-f]{1,4}){1,6})|((:[0-9A-Fa-f]{1,4}){0,4}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(:(((:[0-9A-Fa-f]{1,4}){1,7})|((:[0-9A-Fa-f]{1,4}){0,5}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:)))(%.+)?\s*$))',
     'mac_t': r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$',
-    'url_t': r'^https?://.*',
     'uuid_t': r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}',
     'datetime_t': r'^\d{4}-\d{2}-\d{2}[Tt]\d{2}:\d{2}:\d{2}(?:\.\d+)?([Zz]|[\+-]\d{2}:\d{2})?$'
 }
 
+# Patterns built only from ASCII character classes skip Unicode matching tables
+_ASCII_DATA_TYPES = {'file_hash_t', 'hostname_t', 'mac_t', 'uuid_t'}
+
+
+def _compile_data_type_pattern(data_type: str, pattern: str) -> Any:
+    """
+    Compile an OCSF data type pattern for full-string matching with RE2 when enabled, falling back to re
+    
+    Explicit ^/$ anchors are removed since patterns are applied with fullmatch, which
+    anchors both ends (and, unlike $, does not accept a trailing newline).
+    """
+    if pattern.startswith('^'):
+        pattern = pattern[1:]
+    if pattern.endswith('$') and not pattern.endswith('\\$'):
+        pattern = pattern[:-1]
+    
+    if USE_RE2:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass  # Pattern not supported by RE2 - use re
+    return re.compile(pattern, re.ASCII if data_type in _ASCII_DATA_TYPES else 0)
+
+
+# Compiled once at import so validation does not go through the re module cache per value
+OCSF_DATA_TYPE_PATTERNS = {
+    data_type: _compile_data_type_pattern(data_type, pattern)
+    for data_type, pattern in _OCSF_DATA_TYPE_REGEX_SOURCES.items()
+}
+
+
+def _is_ip_address(value: str) -> bool:
+    """Validate ip_t (IPv4 or IPv6, optional scope id) with the ipaddress parser"""
+    try:
+        ipaddress.ip_address(value.strip())
+        return True
+    except ValueError:
+        return False
+
+
+def _is_http_url(value: str) -> bool:
+    """Validate url_t (http or https scheme)"""
+    return value.startswith(('http://', 'https://'))
+
+
+# Data types validated by a dedicated parser or string check instead of a regex
+OCSF_DATA_TYPE_CHECKS: Dict[str, Callable[[str], bool]] = {
+    'ip_t': _is_ip_address,
+    'url_t': _is_http_url
+}
+
 # OCSF enumeration values
 OCSF_ENUMS = {
     'severity_id': {0: 'Unknown', 1: 'Informational', 2: 'Low', 3: 'Medium', 4: 'High', 5: 'Critical', 6: 'Fatal', 99: 'Other'},
@@ -32,6 +95,116 @@ OCSF_ENUMS = {
     'risk_level_id': {0: 'Info', 1: 'Low', 2: 'Medium', 3: 'High', 4: 'Critical', 99: 'Other'}
 }
 
+# Valid ids per OCSF enumeration and the value list used in validation errors
+OCSF_ENUM_VALID_IDS = {field: frozenset(values) for field, values in OCSF_ENUMS.items()}
+_OCSF_ENUM_VALID_REPR = {field: str(list(values.keys())) for field, values in OCSF_ENUMS.items()}
+
+# Required and recommended fields (ordered tuples for messages, frozensets for missing-field checks)
+REQUIRED_BASE_FIELDS = (
+    'activity_id', 'category_uid', 'class_uid', 'finding_info',
+    'metadata', 'severity_id', 'time', 'type_uid'
+)
+RECOMMENDED_DETECTION_FIELDS = ('confidence_id', 'evidences', 'resources', 'is_alert')
+REQUIRED_METADATA_FIELDS = ('version', 'product')
+RECOMMENDED_PRODUCT_FIELDS = ('name', 'vendor_name')
+REQUIRED_BASE_OBJECTS = ('finding_info', 'metadata')
+TIMESTAMP_FIELDS = ('time', 'start_time', 'end_time')
+STRING_FIELDS = ('activity_name', 'category_name', 'class_name', 'type_name', 'severity', 'status')
+
+_REQUIRED_BASE_FIELD_SET = frozenset(REQUIRED_BASE_FIELDS)
+_RECOMMENDED_DETECTION_FIELD_SET = frozenset(RECOMMENDED_DETECTION_FIELDS)
+
+
+# Prebuilt messages for fixed field sets - repeated issues share one string object, so
+# formatting is skipped per event and deduplicating across events reuses the cached hash
+_MISSING_BASE_FIELD_ERRORS = {field: f"Missing required field: {field}" for field in REQUIRED_BASE_FIELDS}
+_MISSING_DETECTION_FIELD_WARNINGS = {field: f"Recommended field missing: {field}" for field in RECOMMENDED_DETECTION_FIELDS}
+
+# Object structure rules: (object key, required fields, recommended fields, nested object rules)
+OCSF_OBJECT_SCHEMAS: Tuple[tuple, ...] = (
+    ('finding_info', ('uid',), ('title',), ()),
+    ('metadata', REQUIRED_METADATA_FIELDS, (), (
+        ('product', (), RECOMMENDED_PRODUCT_FIELDS, ()),
+    )),
+    ('cloud', ('provider',), ('account',), ())
+)
+
+# Compiled object rule: (key, type error, (field, message) required, (field, message) recommended, nested rules)
+ObjectCheck = Tuple[str, str, Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...], tuple]
+
+
+def _compile_object_check(schema: tuple, parent_path: str = '') -> ObjectCheck:
+    """Expand an object schema into (key, type error, required, recommended, nested) with prebuilt messages"""
+    key, required, recommended, nested = schema
+    path = f"{parent_path}.{key}" if parent_path else key
+    return (
+        key,
+        f"{path} should be an object",
+        tuple((field, f"{path}.{field} is required") for field in required),
+        tuple((field, f"{path}.{field} is recommended") for field in recommended),
+        tuple(_compile_object_check(nested_schema, path) for nested_schema in nested)
+    )
+
+
+_OBJECT_CHECKS: Tuple[ObjectCheck, ...] = tuple(_compile_object_check(schema) for schema in OCSF_OBJECT_SCHEMAS)
+
+
+def _missing_fields(obj: Dict[str, Any], fields: Tuple[str, ...], field_set: frozenset) -> List[str]:
+    """Return fields missing from obj in declaration order (empty when all are present)"""
+    missing = field_set - obj.keys()
+    if not missing:
+        return []
+    return [field for field in fields if field in missing]
+
+
+def _add_error(result: Dict[str, Any], message: str) -> None:
+    """Record a validation error unless the result's max_errors cap has been reached"""
+    errors = result['errors']
+    max_errors = result['_max_errors']
+    if max_errors is None or len(errors) < max_errors:
+        errors.append(message)
+
+
+def _add_warning(result: Dict[str, Any], message: str) -> None:
+    """Record a validation warning unless the result's max_errors cap has been reached"""
+    warnings = result['warnings']
+    max_errors = result['_max_errors']
+    if max_errors is None or len(warnings) < max_errors:
+        warnings.append(message)
+
+
+_UTC = timezone.utc
+
+# Azure to OCSF id mappings used by OCSFDataTypeConverter (unmapped values become 99 = Other)
+AZURE_SEVERITY_TO_OCSF = {
+    'Informational': 1,
+    'Low': 2,
+    'Medium': 3,
+    'High': 4,
+    'Critical': 5
+}
+
+AZURE_CONFIDENCE_TO_OCSF = {
+    'Unknown': 0,
+    'Low': 1,
+    'Medium': 2,
+    'High': 3
+}
+
+AZURE_STATUS_TO_OCSF = {
+    'New': 1,
+    'Active': 1,
+    'InProgress': 2,
+    'Dismissed': 3,
+    'Resolved': 4,
+    'Closed': 4
+}
+
+# Constant parts of the objects built by OCSFDataTypeConverter (copied per call, never shared)
+_AZURE_CLOUD_ACCOUNT_TEMPLATE = {'type': 'Azure Subscription', 'type_id': 10}
+_METADATA_TEMPLATE = {'version': '1.7.0', 'profiles': ('security_control',)}
+_METADATA_PRODUCT_TEMPLATE = {'version': '1.0'}
+
 # OCSF Class UIDs
 OCSF_CLASS_UIDS = {
     'detection_finding': 2004,
@@ -47,16 +220,36 @@ class OCSFValidator:
     OCSF Schema Validator for ensuring events comply with OCSF v1.7.0-dev standards
     """
     
+    __slots__ = ('logger', '_log_info', '_log_warning', '_log_error',
+                 '_class_validation_steps', '_default_validation_steps')
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
+        
+        # Bound once - these are called for every validated event
+        self._log_info = self.logger.info
+        self._log_warning = self.logger.warning
+        self._log_error = self.logger.error
+        
+        # Validation steps per event class, resolved once: base fields, class-specific
+        # requirements, then data types, enumerations and object structures
+        common_steps = (self._validate_data_types, self._validate_enumerations, self._validate_object_structures)
+        self._class_validation_steps = {
+            'detection_finding': (self._validate_base_fields, self._validate_detection_finding) + common_steps,
+            'compliance_finding': (self._validate_base_fields, self._validate_compliance_finding) + common_steps
+        }
+        self._default_validation_steps = (self._validate_base_fields,) + common_steps
     
-    def validate_ocsf_event(self, event: Dict[str, Any], event_class: str = 'detection_finding') -> Dict[str, Any]:
+    def validate_ocsf_event(self, event: Dict[str, Any], event_class: str = 'detection_finding',
+                            fail_fast: bool = False, max_errors: Optional[int] = None) -> Dict[str, Any]:
         """
         Validate an OCSF event against schema requirements
         
         Args:
             event: OCSF event dictionary
             event_class: OCSF event class name
+            fail_fast: Stop after the first validation step that marks the event invalid
+            max_errors: Maximum number of errors (and warnings) to collect, None for no limit
             
         Returns:
             Dictionary with validation results
@@ -66,180 +259,159 @@ class OCSFValidator:
             'errors': [],
             'warnings': [],
             'event_class': event_class,
-            'schema_version': '1.7.0'
+            'schema_version': '1.7.0',
+            '_max_errors': max_errors  # Read by _add_error/_add_warning, removed before returning
         }
         
+        validation_steps = self._class_validation_steps.get(event_class, self._default_validation_steps)
+        
         try:
-            # Validate required base fields
-            self._validate_base_fields(event, validation_result)
-            
-            # Validate class-specific requirements
-            if event_class == 'detection_finding':
-                self._validate_detection_finding(event, validation_result)
-            elif event_class == 'compliance_finding':
-                self._validate_compliance_finding(event, validation_result)
-            
-            # Validate data types
-            self._validate_data_types(event, validation_result)
-            
-            # Validate enumerations
-            self._validate_enumerations(event, validation_result)
-            
-            # Validate object structures
-            self._validate_object_structures(event, validation_result)
+            for validate_step in validation_steps:
+                validate_step(event, validation_result)
+                
+                if fail_fast and not validation_result['is_valid']:
+                    break
+                if max_errors is not None and len(validation_result['errors']) >= max_errors:
+                    break
             
         except Exception as e:
             validation_result['is_valid'] = False
-            validation_result['errors'].append(f"Validation exception: {str(e)}")
-            self.logger.error(f"OCSF validation failed: {str(e)}")
+            _add_error(validation_result, f"Validation exception: {str(e)}")
+            self._log_error(f"OCSF validation failed: {str(e)}")
+        
+        del validation_result['_max_errors']
         
         # Log results
         if validation_result['is_valid']:
-            self.logger.info(f"OCSF event validation passed for {event_class}")
+            self._log_info("OCSF event validation passed for %s", event_class)
         else:
-            self.logger.warning(f"OCSF event validation failed for {event_class}: {len(validation_result['errors'])} errors")
+            self._log_warning("OCSF event validation failed for %s: %d errors", event_class, len(validation_result['errors']))
         
         return validation_result
     
-    def _validate_base_fields(self, event: Dict[str, Any], result: Dict[str, Any]):
+    def _validate_base_fields(self, event: Dict[str, Any], result: Dict[str, Any]) -> None:
         """Validate required base fields for all OCSF events"""
-        required_fields = [
-            'activity_id', 'category_uid', 'class_uid', 'finding_info', 
-            'metadata', 'severity_id', 'time', 'type_uid'
-        ]
-        
-        for field in required_fields:
-            if field not in event:
-                result['errors'].append(f"Missing required field: {field}")
-                result['is_valid'] = False
+        for field in _missing_fields(event, REQUIRED_BASE_FIELDS, _REQUIRED_BASE_FIELD_SET):
+            _add_error(result, _MISSING_BASE_FIELD_ERRORS[field])
+            result['is_valid'] = False
+        
+        # Read each identifier once (defaults match the type_uid calculation below)
+        get = event.get
+        category_uid = get('category_uid')
+        class_uid = get('class_uid', 0)
+        activity_id = get('activity_id', 0)
+        type_uid = get('type_uid')
         
         # Validate category_uid is 2 (Findings)
-        if event.get('category_uid') != 2:
-            result['errors'].append(f"Invalid category_uid: expected 2 (Findings), got {event.get('category_uid')}")
+        if category_uid != 2:
+            _add_error(result, f"Invalid category_uid: expected 2 (Findings), got {category_uid}")
             result['is_valid'] = False
         
         # Validate type_uid calculation
-        expected_type_uid = event.get('class_uid', 0) * 100 + event.get('activity_id', 0)
-        if event.get('type_uid') != expected_type_uid:
-            result['warnings'].append(f"type_uid should be {expected_type_uid} (class_uid * 100 + activity_id)")
+        expected_type_uid = class_uid * 100 + activity_id
+        if type_uid != expected_type_uid:
+            _add_warning(result, f"type_uid should be {expected_type_uid} (class_uid * 100 + activity_id)")
     
-    def _validate_detection_finding(self, event: Dict[str, Any], result: Dict[str, Any]):
+    def _validate_detection_finding(self, event: Dict[str, Any], result: Dict[str, Any]) -> None:
         """Validate Detection Finding specific requirements"""
-        if event.get('class_uid') != 2004:
-            result['errors'].append(f"Invalid class_uid for detection_finding: expected 2004, got {event.get('class_uid')}")
+        class_uid = event.get('class_uid')
+        if class_uid != 2004:
+            _add_error(result, f"Invalid class_uid for detection_finding: expected 2004, got {class_uid}")
             result['is_valid'] = False
         
         # Validate recommended fields
-        recommended_fields = ['confidence_id', 'evidences', 'resources', 'is_alert']
-        for field in recommended_fields:
-            if field not in event:
-                result['warnings'].append(f"Recommended field missing: {field}")
+        for field in _missing_fields(event, RECOMMENDED_DETECTION_FIELDS, _RECOMMENDED_DETECTION_FIELD_SET):
+            _add_warning(result, _MISSING_DETECTION_FIELD_WARNINGS[field])
     
-    def _validate_compliance_finding(self, event: Dict[str, Any], result: Dict[str, Any]):
+    def _validate_compliance_finding(self, event: Dict[str, Any], result: Dict[str, Any]) -> None:
         """Validate Compliance Finding specific requirements"""
-        if event.get('class_uid') != 2003:
-            result['errors'].append(f"Invalid class_uid for compliance_finding: expected 2003, got {event.get('class_uid')}")
+        class_uid = event.get('class_uid')
+        if class_uid != 2003:
+            _add_error(result, f"Invalid class_uid for compliance_finding: expected 2003, got {class_uid}")
             result['is_valid'] = False
         
         # Validate required compliance field
         if 'compliance' not in event:
-            result['errors'].append("Missing required field for compliance_finding: compliance")
+            _add_error(result, "Missing required field for compliance_finding: compliance")
             result['is_valid'] = False
     
-    def _validate_data_types(self, event: Dict[str, Any], result: Dict[str, Any]):
+    def _validate_data_types(self, event: Dict[str, Any], result: Dict[str, Any]) -> None:
         """Validate OCSF data types"""
         
-        # Validate timestamp_t fields (should be integers representing milliseconds)
-        timestamp_fields = ['time', 'start_time', 'end_time']
-        for field in timestamp_fields:
+        # Validate timestamp_t fields (should be integers representing milliseconds, bool is rejected)
+        for field in TIMESTAMP_FIELDS:
             if field in event:
                 value = event[field]
-                if not isinstance(value, int):
-                    result['errors'].append(f"{field} should be timestamp_t (integer milliseconds), got {type(value).__name__}")
+                if type(value) is not int:
+                    _add_error(result, f"{field} should be timestamp_t (integer milliseconds), got {type(value).__name__}")
                     result['is_valid'] = False
                 elif value < 0 or value > 9999999999999:  # Reasonable timestamp range
-                    result['warnings'].append(f"{field} timestamp seems out of reasonable range: {value}")
+                    _add_warning(result, f"{field} timestamp seems out of reasonable range: {value}")
         
         # Validate string fields
-        string_fields = ['activity_name', 'category_name', 'class_name', 'type_name', 'severity', 'status']
-        for field in string_fields:
-            if field in event and not isinstance(event[field], str):
-                result['warnings'].append(f"{field} should be string_t, got {type(event[field]).__name__}")
+        for field in STRING_FIELDS:
+            if field in event:
+                value = event[field]
+                if type(value) is not str:
+                    _add_warning(result, f"{field} should be string_t, got {type(value).__name__}")
     
-    def _validate_enumerations(self, event: Dict[str, Any], result: Dict[str, Any]):
+    def _validate_enumerations(self, event: Dict[str, Any], result: Dict[str, Any]) -> None:
         """Validate OCSF enumeration values"""
-        for field, valid_values in OCSF_ENUMS.items():
+        for field, valid_ids in OCSF_ENUM_VALID_IDS.items():
             if field in event:
                 value = event[field]
-                if value not in valid_values:
-                    result['errors'].append(f"Invalid {field} value: {value}. Valid values: {list(valid_values.keys())}")
+                if value not in valid_ids:
+                    _add_error(result, f"Invalid {field} value: {value}. Valid values: {_OCSF_ENUM_VALID_REPR[field]}")
                     result['is_valid'] = False
     
-    def _validate_object_structures(self, event: Dict[str, Any], result: Dict[str, Any]):
+    def _validate_object_structures(self, event: Dict[str, Any], result: Dict[str, Any]) -> None:
         """Validate OCSF object structures"""
         
-        # Validate finding_info object
-        if 'finding_info' in event:
-            finding_info = event['finding_info']
-            if not isinstance(finding_info, dict):
-                result['errors'].append("finding_info should be an object")
-                result['is_valid'] = False
-            else:
-                if 'uid' not in finding_info:
-                    result['errors'].append("finding_info.uid is required")
+        # Validate finding_info, metadata (and metadata.product) and cloud objects
+        for object_check in _OBJECT_CHECKS:
+            key, type_error = object_check[0], object_check[1]
+            if key in event:
+                obj = event[key]
+                if not isinstance(obj, dict):
+                    _add_error(result, type_error)
                     result['is_valid'] = False
-                if 'title' not in finding_info:
-                    result['warnings'].append("finding_info.title is recommended")
-        
-        # Validate metadata object
-        if 'metadata' in event:
-            metadata = event['metadata']
-            if not isinstance(metadata, dict):
-                result['errors'].append("metadata should be an object")
-                result['is_valid'] = False
-            else:
-                required_metadata = ['version', 'product']
-                for field in required_metadata:
-                    if field not in metadata:
-                        result['errors'].append(f"metadata.{field} is required")
-                        result['is_valid'] = False
-                
-                # Validate product object
-                if 'product' in metadata and isinstance(metadata['product'], dict):
-                    product = metadata['product']
-                    required_product_fields = ['name', 'vendor_name']
-                    for field in required_product_fields:
-                        if field not in product:
-                            result['warnings'].append(f"metadata.product.{field} is recommended")
-        
-        # Validate cloud object
-        if 'cloud' in event:
-            cloud = event['cloud']
-            if not isinstance(cloud, dict):
-                result['errors'].append("cloud should be an object")
-                result['is_valid'] = False
-            else:
-                if 'provider' not in cloud:
-                    result['errors'].append("cloud.provider is required")
-                    result['is_valid'] = False
-                if 'account' not in cloud:
-                    result['warnings'].append("cloud.account is recommended")
+                else:
+                    self._check_object_fields(obj, object_check, result)
         
         # Validate observables array
         if 'observables' in event:
             observables = event['observables']
             if not isinstance(observables, list):
-                result['errors'].append("observables should be an array")
+                _add_error(result, "observables should be an array")
                 result['is_valid'] = False
             else:
                 for i, observable in enumerate(observables):
                     if not isinstance(observable, dict):
-                        result['errors'].append(f"observables[{i}] should be an object")
+                        _add_error(result, f"observables[{i}] should be an object")
                         result['is_valid'] = False
                     elif 'type_id' not in observable:
-                        result['errors'].append(f"observables[{i}].type_id is required")
+                        _add_error(result, f"observables[{i}].type_id is required")
                         result['is_valid'] = False
     
+    def _check_object_fields(self, obj: Dict[str, Any], object_check: ObjectCheck, result: Dict[str, Any]) -> None:
+        """Check required/recommended fields of an object and its nested objects"""
+        _, _, required, recommended, nested = object_check
+        
+        for field, message in required:
+            if field not in obj:
+                _add_error(result, message)
+                result['is_valid'] = False
+        
+        for field, message in recommended:
+            if field not in obj:
+                _add_warning(result, message)
+        
+        # Nested objects are only checked when present as objects
+        for nested_check in nested:
+            nested_obj = obj.get(nested_check[0])
+            if isinstance(nested_obj, dict):
+                self._check_object_fields(nested_obj, nested_check, result)
+    
     def validate_data_type_pattern(self, value: str, data_type: str) -> bool:
         """
         Validate a value against OCSF data type pattern
@@ -251,14 +423,17 @@ class OCSFValidator:
         Returns:
             True if value matches pattern, False otherwise
         """
-        if data_type not in OCSF_DATA_TYPE_PATTERNS:
+        check = OCSF_DATA_TYPE_CHECKS.get(data_type)
+        pattern = OCSF_DATA_TYPE_PATTERNS.get(data_type)
+        if check is None and pattern is None:
             return True  # No pattern to validate against
         
-        pattern = OCSF_DATA_TYPE_PATTERNS[data_type]
         try:
-            return re.match(pattern, value) is not None
+            if check is not None:
+                return check(value)
+            return pattern.fullmatch(value) is not None
         except Exception as e:
-            self.logger.warning(f"Error validating {data_type} pattern: {str(e)}")
+            self._log_warning(f"Error validating {data_type} pattern: {str(e)}")
             return False
     
     def validate_timestamp_range(self, timestamp: int) -> bool:
@@ -304,8 +479,7 @@ class OCSFValidator:
         missing = []
         
         # Base requirements for all findings
-        base_required = ['finding_info', 'metadata']
-        for obj in base_required:
+        for obj in REQUIRED_BASE_OBJECTS:
             if obj not in event or not isinstance(event[obj], dict):
                 missing.append(obj)
         
@@ -327,32 +501,31 @@ class OCSFValidator:
             Summary validation report
         """
         total_events = len(validation_results)
-        valid_events = sum(1 for result in validation_results if result['is_valid'])
+        valid_events = 0
         
-        all_errors = []
-        all_warnings = []
+        # Single pass: count validity and error/warning frequencies
+        error_counts = Counter()
+        warning_counts = Counter()
         
         for result in validation_results:
-            all_errors.extend(result.get('errors', []))
-            all_warnings.extend(result.get('warnings', []))
-        
-        # Count unique error/warning types
-        unique_errors = list(set(all_errors))
-        unique_warnings = list(set(all_warnings))
+            if result['is_valid']:
+                valid_events += 1
+            error_counts.update(result.get('errors', ()))
+            warning_counts.update(result.get('warnings', ()))
         
         return {
             'total_events': total_events,
             'valid_events': valid_events,
             'invalid_events': total_events - valid_events,
             'validation_rate': (valid_events / total_events * 100) if total_events > 0 else 0,
-            'total_errors': len(all_errors),
-            'unique_errors': len(unique_errors),
-            'total_warnings': len(all_warnings),
-            'unique_warnings': len(unique_warnings),
-            'error_types': unique_errors[:10],  # Top 10 error types
-            'warning_types': unique_warnings[:10],  # Top 10 warning types
+            'total_errors': sum(error_counts.values()),
+            'unique_errors': len(error_counts),
+            'total_warnings': sum(warning_counts.values()),
+            'unique_warnings': len(warning_counts),
+            'error_types': [error for error, _ in error_counts.most_common(10)],  # Top 10 error types
+            'warning_types': [warning for warning, _ in warning_counts.most_common(10)],  # Top 10 warning types
             'schema_version': '1.7.0',
-            'validation_timestamp': int(datetime.utcnow().timestamp() * 1000)
+            'validation_timestamp': time.time_ns() // 1_000_000
         }
 
 
@@ -366,65 +539,45 @@ class OCSFDataTypeConverter:
         """Convert ISO timestamp to OCSF timestamp_t (milliseconds since epoch)"""
         try:
             if not iso_timestamp:
-                return int(datetime.utcnow().timestamp() * 1000)
+                return time.time_ns() // 1_000_000
             
-            if iso_timestamp.endswith('Z'):
-                dt = datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00'))
-            elif '+' in iso_timestamp:
+            try:
                 dt = datetime.fromisoformat(iso_timestamp)
-            else:
-                dt = datetime.fromisoformat(iso_timestamp + '+00:00' if 'T' in iso_timestamp else iso_timestamp)
+            except ValueError:
+                # Python < 3.11 does not accept a trailing 'Z'
+                if not iso_timestamp.endswith('Z'):
+                    raise
+                dt = datetime.fromisoformat(iso_timestamp[:-1] + '+00:00')
+            
+            # Timestamps without an offset are UTC
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=_UTC)
             
             return int(dt.timestamp() * 1000)
         except Exception:
-            return int(datetime.utcnow().timestamp() * 1000)
+            return time.time_ns() // 1_000_000
     
     @staticmethod
     def map_severity_to_ocsf(azure_severity: str) -> int:
         """Map Azure severity to OCSF severity_id"""
-        mapping = {
-            'Informational': 1,
-            'Low': 2,
-            'Medium': 3, 
-            'High': 4,
-            'Critical': 5
-        }
-        return mapping.get(azure_severity, 99)  # 99 = Other
+        return AZURE_SEVERITY_TO_OCSF.get(azure_severity, 99)  # 99 = Other
     
     @staticmethod
     def map_confidence_to_ocsf(azure_confidence: str) -> int:
         """Map Azure confidence to OCSF confidence_id"""
-        mapping = {
-            'Unknown': 0,
-            'Low': 1,
-            'Medium': 2,
-            'High': 3
-        }
-        return mapping.get(azure_confidence, 99)  # 99 = Other
+        return AZURE_CONFIDENCE_TO_OCSF.get(azure_confidence, 99)  # 99 = Other
     
     @staticmethod
     def map_status_to_ocsf(azure_status: str) -> int:
         """Map Azure status to OCSF status_id"""
-        mapping = {
-            'New': 1,
-            'Active': 1,
-            'InProgress': 2,
-            'Dismissed': 3,
-            'Resolved': 4,
-            'Closed': 4
-        }
-        return mapping.get(azure_status, 99)  # 99 = Other
+        return AZURE_STATUS_TO_OCSF.get(azure_status, 99)  # 99 = Other
     
     @staticmethod
     def create_ocsf_cloud_object(subscription_id: str, tenant_id: str = '', region: str = '') -> Dict[str, Any]:
         """Create OCSF-compliant cloud object for Azure"""
         cloud_obj = {
             'provider': 'Azure',
-            'account': {
-                'uid': subscription_id,
-                'type': 'Azure Subscription',
-                'type_id': 10
-            }
+            'account': {'uid': subscription_id, **_AZURE_CLOUD_ACCOUNT_TEMPLATE}
         }
         
         if tenant_id:
@@ -443,13 +596,9 @@ class OCSFDataTypeConverter:
                                    original_time: str = '') -> Dict[str, Any]:
         """Create OCSF-compliant metadata object"""
         metadata_obj = {
-            'version': '1.7.0',
-            'product': {
-                'name': product_name,
-                'vendor_name': vendor_name,
-                'version': '1.0'
-            },
-            'profiles': ['security_control']
+            'version': _METADATA_TEMPLATE['version'],
+            'product': {'name': product_name, 'vendor_name': vendor_name, **_METADATA_PRODUCT_TEMPLATE},
+            'profiles': list(_METADATA_TEMPLATE['profiles'])
         }
         
         if event_code:
@@ -7,69 +7,285 @@ import json
 import logging
 import os
 import re
+import time
 import uuid
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, asdict
 from functools import lru_cache
+from json.encoder import encode_basestring_ascii
 
 try:
-    from jsonpath_ng import parse as jsonpath_parse
+    from jsonpath_ng.parser import JsonPathParser
+    from jsonpath_ng.jsonpath import Child, Fields, Root
     from jsonpath_ng.exceptions import JSONPathError
 except ImportError:
     # Fallback for local development
-    jsonpath_parse = None
+    JsonPathParser = None
+    Child = Fields = Root = None
     class JSONPathError(Exception):
         pass
 
 try:
-    from jinja2 import Environment, Template, BaseLoader, TemplateError
-    from jinja2.sandbox import SandboxedEnvironment
+    from jinja2 import Environment, Template, BaseLoader, TemplateError, meta
 except ImportError:
     # Fallback for local development
     Environment = None
     Template = None
     BaseLoader = None
     TemplateError = Exception
-    SandboxedEnvironment = None
+    meta = None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 import yaml
+try:
+    # libyaml-backed loader (bundled with the PyYAML manylinux wheels) - much faster than pure Python
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
 from core.cloudtrail_types import CloudTrailAuditEvent
 
+# Single JSONPath parser reused for all expressions - jsonpath_ng.parse() builds a new
+# parser (and its PLY tables) on every call
+_JSONPATH_PARSER = JsonPathParser() if JsonPathParser else None
+
+# Transformation templates shipped with the function (core/../templates)
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates')
+
 # Environment Variables
 VALIDATE_OCSF = os.getenv('VALIDATE_OCSF', 'false').lower() == 'true'
+# Render templates in Jinja2's SandboxedEnvironment (templates ship with the deployment package,
+# so the per-attribute sandbox checks are opt-in, e.g. for template development)
+TEMPLATE_SANDBOX = os.getenv('TEMPLATE_SANDBOX', 'false').lower() == 'true'
+
+# jsonschema is only needed for OCSF validation - imported on first use (None = not attempted yet)
+jsonschema = None
+JSONSCHEMA_AVAILABLE = None
+
+
+def _load_jsonschema():
+    """Import jsonschema for OCSF validation on first use"""
+    global jsonschema, JSONSCHEMA_AVAILABLE
+    if JSONSCHEMA_AVAILABLE is None:
+        try:
+            import jsonschema as _jsonschema
+            jsonschema = _jsonschema
+            JSONSCHEMA_AVAILABLE = True
+        except ImportError:
+            JSONSCHEMA_AVAILABLE = False
+    return jsonschema
+
+
+# Pay the import during Lambda init when validation is enabled
+if VALIDATE_OCSF:
+    _load_jsonschema()
 
-# Try to import jsonschema for OCSF validation
-try:
-    import jsonschema
-    JSONSCHEMA_AVAILABLE = True
-except ImportError:
-    jsonschema = None
-    JSONSCHEMA_AVAILABLE = False
 
+# Event fields that must match the OCSF class definition, with their names in validation errors
+_OCSF_CLASS_CONSISTENCY_FIELDS = (
+    ('class_name', 'class name'),
+    ('category_name', 'category name'),
+    ('category_uid', 'category uid'),
+)
+
+# Deprecated OCSF classes (class_uid -> validation warning)
+_OCSF_DEPRECATED_CLASSES = {
+    '2001': "OCSF event class: Security Findings (2001) is deprecated!",
+}
+
+# Top-level fields every OCSF event must carry (tuple keeps the error order stable)
+_OCSF_REQUIRED_FIELDS = ('version', 'class_uid', 'category_uid', 'activity_id', 'time')
+_OCSF_REQUIRED_FIELD_SET = frozenset(_OCSF_REQUIRED_FIELDS)
+
+# Values stripped from OCSF events before schema checks (the Security Lake validator's forbidden values)
+_OCSF_FILTERED_VALUES = frozenset((None, 'None'))
+
+
+# OCSF Findings category classes - identical in OCSF 1.1.0 and 1.7.0
+_OCSF_FINDING_CLASSES = {
+    "2001": {"url": "security_finding", "class_name": "Security Finding", "category_name": "Findings", "category_uid": 2},
+    "2002": {"url": "vulnerability_finding", "class_name": "Vulnerability Finding", "category_name": "Findings", "category_uid": 2},
+    "2003": {"url": "compliance_finding", "class_name": "Compliance Finding", "category_name": "Findings", "category_uid": 2},
+    "2004": {"url": "detection_finding", "class_name": "Detection Finding", "category_name": "Findings", "category_uid": 2},
+    "2005": {"url": "incident_finding", "class_name": "Incident Finding", "category_name": "Findings", "category_uid": 2}
+}
 
 # OCSF Class Dictionary for validation (from Amazon Security Lake validator)
 OCSF_CLASS_DICTIONARY = {
-    "1.7.0": {
-        "2001": {"url": "security_finding", "class_name": "Security Finding", "category_name": "Findings", "category_uid": 2},
-        "2002": {"url": "vulnerability_finding", "class_name": "Vulnerability Finding", "category_name": "Findings", "category_uid": 2},
-        "2003": {"url": "compliance_finding", "class_name": "Compliance Finding", "category_name": "Findings", "category_uid": 2},
-        "2004": {"url": "detection_finding", "class_name": "Detection Finding", "category_name": "Findings", "category_uid": 2},
-        "2005": {"url": "incident_finding", "class_name": "Incident Finding", "category_name": "Findings", "category_uid": 2}
-    },
-    "1.1.0": {
-        "2001": {"url": "security_finding", "class_name": "Security Finding", "category_name": "Findings", "category_uid": 2},
-        "2002": {"url": "vulnerability_finding", "class_name": "Vulnerability Finding", "category_name": "Findings", "category_uid": 2},
-        "2003": {"url": "compliance_finding", "class_name": "Compliance Finding", "category_name": "Findings", "category_uid": 2},
-        "2004": {"url": "detection_finding", "class_name": "Detection Finding", "category_name": "Findings", "category_uid": 2},
-        "2005": {"url": "incident_finding", "class_name": "Incident Finding", "category_name": "Findings", "category_uid": 2}
-    },
-    "1.0.0-rc.2": {
-        "2001": {"url": "security_finding", "class_name": "Security Finding", "category_name": "Findings", "category_uid": 2}
-    }
+    "1.7.0": _OCSF_FINDING_CLASSES,
+    "1.1.0": _OCSF_FINDING_CLASSES,
+    "1.0.0-rc.2": {"2001": _OCSF_FINDING_CLASSES["2001"]}
 }
 
 
+# Filter lookup tables - built once at import instead of on every filter call
+_SEVERITY_FORMAT_MAP = {
+    'informational': 'Low',
+    'low': 'Low',
+    'medium': 'Medium',
+    'high': 'High',
+    'critical': 'Critical'
+}
+
+_AZURE_SEVERITY_TO_OCSF_ID = {
+    'Informational': 1,
+    'Low': 2,
+    'Medium': 3,
+    'High': 4,
+    'Critical': 5
+}
+
+_ALERT_STATUS_TO_OCSF_ID = {
+    'New': 1,
+    'Active': 1,
+    'InProgress': 2,
+    'Dismissed': 3,
+    'Resolved': 4,
+    'Closed': 4
+}
+
+_CONFIDENCE_LEVEL_TO_OCSF_ID = {
+    'High': 3,
+    'Medium': 2,
+    'Low': 1,
+    'Unknown': 0
+}
+
+_MITRE_TACTIC_IDS = {
+    'DefenseEvasion': 'TA0005',
+    'LateralMovement': 'TA0008',
+    'PrivilegeEscalation': 'TA0004',
+    'Persistence': 'TA0003',
+    'InitialAccess': 'TA0001',
+    'Execution': 'TA0002',
+    'Discovery': 'TA0007',
+    'Collection': 'TA0009',
+    'Exfiltration': 'TA0010',
+    'Impact': 'TA0040'
+}
+
+_COMPLIANCE_SEVERITY_NAMES = {
+    1: "Informational",
+    2: "Low",
+    3: "Medium",
+    4: "High",
+    5: "Critical"
+}
+
+_ASFF_SEVERITY_LABELS = {
+    'informational': 'INFORMATIONAL',
+    'low': 'LOW',
+    'medium': 'MEDIUM',
+    'high': 'HIGH',
+    'critical': 'CRITICAL'
+}
+
+_ASFF_SEVERITY_NORMALIZED = {
+    'informational': 0,
+    'low': 30,
+    'medium': 60,
+    'high': 80,
+    'critical': 100
+}
+
+# Alert type keyword -> ASFF type (MITRE ATT&CK-based), stored as (lowercase keyword, JSON array)
+_ASFF_TYPE_KEYWORDS = tuple(
+    (keyword.lower(), json.dumps([asff_type]))
+    for keyword, asff_type in (
+        ('Backdoor', 'TTPs/Defense Evasion'),
+        ('Malware', 'Effects/Data Exfiltration'),
+        ('Crypto', 'Effects/Resource Consumption'),
+        ('SQLInjection', 'TTPs/Initial Access'),
+        ('Phishing', 'TTPs/Initial Access'),
+        ('Brute', 'TTPs/Credential Access'),
+        ('Exploit', 'TTPs/Execution'),
+        ('Vulnerability', 'Software and Configuration Checks/Vulnerabilities')
+    )
+)
+_ASFF_DEFAULT_TYPES = json.dumps(['Security Monitoring/Threat Detection'])
+
+_ASFF_COMPLIANCE_STATUS = {
+    'passed': 'PASSED',
+    'pass': 'PASSED',
+    'failed': 'FAILED',
+    'fail': 'FAILED',
+    'not_applicable': 'NOT_APPLICABLE',
+    'notapplicable': 'NOT_APPLICABLE',
+    'unknown': 'UNKNOWN'
+}
+
+# ARCHIVED for passed/healthy states, ACTIVE for everything else
+_ASFF_ARCHIVED_STATES = frozenset(['PASSED', 'PASS', 'HEALTHY'])
+
+# Azure compliance states to Security Hub ReasonCode
+_ASFF_REASON_CODES = {
+    # Pass states
+    'passed': 'PASSED',
+    'pass': 'PASSED',
+    'healthy': 'PASSED',
+    'compliant': 'PASSED',
+    
+    # Fail states
+    'failed': 'FAILED',
+    'fail': 'FAILED',
+    'unhealthy': 'FAILED',
+    'non-compliant': 'FAILED',
+    'noncompliant': 'FAILED',
+    
+    # Warning states
+    'warning': 'WARNING',
+    'degraded': 'WARNING',
+    
+    # Not available states
+    'not_applicable': 'NOT_AVAILABLE',
+    'notapplicable': 'NOT_AVAILABLE',
+    'unknown': 'NOT_AVAILABLE',
+    'pending': 'NOT_AVAILABLE',
+    
+    # No data states
+    'nodata': 'NO_DATA_AVAILABLE',
+    'no_data': 'NO_DATA_AVAILABLE'
+}
+
+_OCSF_COMPLIANCE_STATUS = {
+    'healthy': 'Pass',
+    'unhealthy': 'Fail',
+    'notapplicable': 'Skip',
+    'not_applicable': 'Skip',
+    'unknown': 'Unknown',
+    # Additional status codes that might appear
+    'low': 'Pass',
+    'medium': 'Fail',
+    'high': 'Fail',
+    'critical': 'Fail',
+}
+
+_OCSF_COMPLIANCE_STATUS_ID = {
+    'healthy': 1,       # Pass
+    'unhealthy': 2,     # Fail
+    'notapplicable': 3, # Skip
+    'not_applicable': 3, # Skip
+    'unknown': 99,      # Unknown
+    # Additional status codes that might appear
+    'low': 1,           # Pass (low severity = acceptable)
+    'medium': 2,        # Fail
+    'high': 2,          # Fail
+    'critical': 2,      # Fail
+}
+
+# Status codes as Azure sends them - looked up as-is before falling back to lower()
+for _status_code in ('Healthy', 'Unhealthy', 'NotApplicable', 'Unknown', 'Low', 'Medium', 'High', 'Critical'):
+    _OCSF_COMPLIANCE_STATUS[_status_code] = _OCSF_COMPLIANCE_STATUS[_status_code.lower()]
+    _OCSF_COMPLIANCE_STATUS_ID[_status_code] = _OCSF_COMPLIANCE_STATUS_ID[_status_code.lower()]
+del _status_code
+
+
 @dataclass
 class TransformationTemplate:
     """Definition of a transformation template"""
@@ -80,6 +296,207 @@ class TransformationTemplate:
     template: str  # Jinja2 template
     filters: Optional[Dict[str, Any]] = None  # Custom Jinja2 filters
     conditionals: Optional[Dict[str, Any]] = None  # Conditional logic
+    compiled: Optional[Any] = None  # Compiled Jinja2 template (set when the template is loaded)
+    field_paths: Optional[Dict[str, Tuple[str, ...]]] = None  # Plain-path extractors as key tuples
+    uses_timestamp: bool = True  # Whether the Jinja2 template references {{ timestamp }}
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_timestamp(timestamp_str: str) -> datetime:
+    """
+    Parse an ISO8601 timestamp, accepting a trailing 'Z' on Python versions before 3.11
+    
+    Cached so the timestamp filters applied to the same event value (to_unix_timestamp,
+    normalize_timestamp, add_one_second) share a single parse.
+    """
+    try:
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        if not timestamp_str.endswith('Z'):
+            raise
+        return datetime.fromisoformat(timestamp_str[:-1] + '+00:00')
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a value to a JSON string (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # Non-string keys, integers beyond 64 bits, ... - use the stdlib serializer
+            pass
+    return json.dumps(obj)
+
+
+def _to_json(obj: Any) -> str:
+    """Serialize a value for embedding in rendered template JSON"""
+    if not obj:
+        return '{}'
+    return _json_dumps(obj)
+
+
+def _parse_rendered_json(rendered_json: str) -> Any:
+    """Parse rendered template output (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(rendered_json)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity literals, out-of-range numbers, ... - the stdlib parser
+            # accepts these or raises the error reported by the caller
+            pass
+    return json.loads(rendered_json)
+
+
+# Runs of characters that are not lowercase alphanumerics, collapsed to one hyphen by slugify
+_SLUG_NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]+')
+
+
+@lru_cache(maxsize=512)
+def _slugify_text(text: str) -> str:
+    """Slug of a non-blank string - inputs are a small recurring set (MITRE tactics, categories)"""
+    # Replace runs of spaces and special characters (including hyphens) with a single hyphen
+    # Keep only alphanumeric characters and hyphens, then remove leading/trailing hyphens
+    return _SLUG_NON_ALNUM_PATTERN.sub('-', text.lower()).strip('-')
+
+
+# Stateless template filters - defined once at import rather than as per-engine lambdas
+def _generate_uuid() -> str:
+    return str(uuid.uuid4())
+
+
+def _safe_get(obj: Any, key: Any, default: Any = None) -> Any:
+    return obj.get(key, default) if isinstance(obj, dict) else default
+
+
+def _truncate(s: Any, length: int = 500) -> Any:
+    return s[:length] + '...' if isinstance(s, str) and len(s) > length else s
+
+
+def _safe_string(s: Any) -> str:
+    return str(s) if s is not None else 'Unknown'
+
+
+@lru_cache(maxsize=1024)
+def _compile_jsonpath(jsonpath_expr: str):
+    """Parse a JSONPath expression, shared by all extractor instances"""
+    if _JSONPATH_PARSER is None:
+        raise ImportError("jsonpath-ng not available")
+    return _JSONPATH_PARSER.parse(jsonpath_expr)
+
+
+# Sentinel for keys missing from the event (a present key may hold None)
+_NOT_SET = object()
+
+
+@lru_cache(maxsize=1024)
+def _plain_field_path(jsonpath_expr: str) -> Optional[Tuple[str, ...]]:
+    """
+    Return the key sequence of a plain field path such as $.properties.severity
+    
+    Returns None for expressions that need the jsonpath-ng evaluator (wildcards,
+    indexes, descendants, unions, filters).
+    """
+    node = _compile_jsonpath(jsonpath_expr)
+    keys = []
+    while isinstance(node, Child):
+        right = node.right
+        if not isinstance(right, Fields) or len(right.fields) != 1 or right.fields[0] == '*':
+            return None
+        keys.append(right.fields[0])
+        node = node.left
+    
+    if isinstance(node, Fields) and len(node.fields) == 1 and node.fields[0] != '*':
+        keys.append(node.fields[0])
+    elif not isinstance(node, Root):
+        return None
+    
+    return tuple(reversed(keys))
+
+
+def _resolve_field_path(data: Any, keys: Tuple[str, ...]) -> Any:
+    """Walk a plain field path with the same semantics as jsonpath-ng Fields lookups"""
+    value = data
+    for key in keys:
+        try:
+            value = value.get(key, _NOT_SET)
+        except (TypeError, AttributeError):
+            return None
+        if value is _NOT_SET:
+            return None
+    return value
+
+
+# Parsed template files keyed by path - the templates directory is read-only in Lambda, so
+# each file is read and YAML-parsed at most once per container rather than once per mapper
+_TEMPLATE_FILES: Dict[str, Dict[str, Any]] = {}
+
+
+def _read_template_file(template_path: str) -> Dict[str, Any]:
+    """Return the parsed YAML of a template file (raises FileNotFoundError if it does not exist)"""
+    template_data = _TEMPLATE_FILES.get(template_path)
+    if template_data is None:
+        with open(template_path, 'r', encoding='utf-8') as f:
+            template_data = yaml.load(f, Loader=YamlSafeLoader)
+        _TEMPLATE_FILES[template_path] = template_data
+    return template_data
+
+
+@lru_cache(maxsize=None)
+def _supported_templates(output_format: str) -> Tuple[str, ...]:
+    """Event types with a template file for an output format (the templates directory is read-only)"""
+    if not os.path.exists(TEMPLATES_DIR):
+        return ()
+    
+    templates = []
+    suffix = f'_{output_format}.yaml'
+    
+    for filename in os.listdir(TEMPLATES_DIR):
+        if filename.endswith(suffix):
+            event_type = filename.replace(suffix, '')
+            templates.append(event_type)
+    
+    return tuple(templates)
+
+
+def precompile_extractors(templates_dir: str = TEMPLATES_DIR, logger: Optional[logging.Logger] = None) -> int:
+    """
+    Pre-compile the JSONPath extractors of every template file
+    
+    Intended to run during Lambda init (outside the handler) so expression parsing
+    is not paid on the first events of each template.
+    
+    Args:
+        templates_dir: Directory containing YAML transformation templates
+        logger: Logger instance
+        
+    Returns:
+        Number of distinct expressions compiled
+    """
+    logger = logger or logging.getLogger(__name__)
+    compiled = set()
+    
+    for filename in sorted(os.listdir(templates_dir)):
+        if not filename.endswith(('.yaml', '.yml')):
+            continue
+        try:
+            template_data = _read_template_file(os.path.join(templates_dir, filename))
+            extractors = template_data.get('extractors') or {}
+        except Exception as e:
+            logger.warning(f"Skipping extractor pre-compilation for {filename}: {str(e)}")
+            continue
+        
+        for jsonpath_expr in extractors.values():
+            if not isinstance(jsonpath_expr, str) or jsonpath_expr in compiled:
+                continue
+            try:
+                _compile_jsonpath(jsonpath_expr)
+                _plain_field_path(jsonpath_expr)
+                compiled.add(jsonpath_expr)
+            except Exception as e:
+                logger.warning(f"Failed to pre-compile JSONPath expression '{jsonpath_expr}' in {filename}: {str(e)}")
+    
+    logger.info(f"Pre-compiled {len(compiled)} JSONPath extractor expressions")
+    return len(compiled)
 
 
 class JSONPathExtractor:
@@ -89,13 +506,10 @@ class JSONPathExtractor:
         self.logger = logger or logging.getLogger(__name__)
         self._compiled_expressions = {}
         
-    @lru_cache(maxsize=128)
     def _compile_expression(self, jsonpath_expr: str):
-        """Compile and cache JSONPath expressions for performance"""
+        """Compile and cache JSONPath expressions for performance (cache shared across instances)"""
         try:
-            if jsonpath_parse is None:
-                raise ImportError("jsonpath-ng not available")
-            return jsonpath_parse(jsonpath_expr)
+            return _compile_jsonpath(jsonpath_expr)
         except (JSONPathError, Exception) as e:
             self.logger.error(f"Failed to compile JSONPath expression '{jsonpath_expr}': {str(e)}")
             return None
@@ -105,6 +519,12 @@ class JSONPathExtractor:
         compiled_expr = self._compile_expression(jsonpath_expr)
         if compiled_expr is None:
             return None
+        
+        # Plain field paths (the vast majority of template extractors) resolve with
+        # direct key lookups instead of the jsonpath-ng match machinery
+        field_path = _plain_field_path(jsonpath_expr)
+        if field_path is not None:
+            return _resolve_field_path(data, field_path)
             
         try:
             matches = compiled_expr.find(data)
@@ -126,15 +546,22 @@ class TemplateEngine:
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
         
-        # Use sandboxed environment for security
-        if SandboxedEnvironment:
+        # Templates are trusted deployment artifacts - sandboxing is opt-in via TEMPLATE_SANDBOX
+        if TEMPLATE_SANDBOX and Environment:
+            from jinja2.sandbox import SandboxedEnvironment
             self.env = SandboxedEnvironment()
+        elif Environment:
+            self.env = Environment(autoescape=False)
         else:
             self.env = None
             
         # Register custom filters
         if self.env:
             self.env.filters.update(self._get_custom_filters())
+        
+        # Compiled templates keyed by template source - avoids re-running the Jinja2
+        # lexer, parser and code generator for every event
+        self._compiled_templates: Dict[Tuple[str, Optional[frozenset]], Any] = {}
     
     def _get_custom_filters(self) -> Dict[str, callable]:
         """Custom Jinja2 filters for event transformation"""
@@ -142,9 +569,9 @@ class TemplateEngine:
             # CloudTrail filters
             'normalize_timestamp': self._normalize_timestamp,
             'format_severity': self._format_severity,
-            'generate_uuid': lambda: str(uuid.uuid4()),
-            'to_json': lambda obj: json.dumps(obj) if obj else '{}',
-            'safe_get': lambda obj, key, default=None: obj.get(key, default) if isinstance(obj, dict) else default,
+            'generate_uuid': _generate_uuid,
+            'to_json': _to_json,
+            'safe_get': _safe_get,
             
             # JSON string escaping (critical for descriptions with newlines)
             'json_escape': self._json_escape_string,
@@ -159,7 +586,7 @@ class TemplateEngine:
             'extract_resource_name': self._extract_resource_name,
             'extract_azure_resource_type': self._extract_azure_resource_type,
             'map_mitre_tactic': self._map_mitre_tactic,
-            'truncate': lambda s, length=500: s[:length] + '...' if isinstance(s, str) and len(s) > length else s,
+            'truncate': _truncate,
             'extract_azure_subscription': self._extract_azure_subscription_from_resources,
             'extract_source_ip': self._extract_source_ip,
             
@@ -170,7 +597,7 @@ class TemplateEngine:
             'calculate_compliance_severity_name': self._calculate_compliance_severity_name,
             
             # Additional secure_score template filters
-            'safe_string': lambda s: str(s) if s is not None else 'Unknown',
+            'safe_string': _safe_string,
             
             # ASFF-specific filters
             'asff_severity_label': self._asff_severity_label,
@@ -208,14 +635,13 @@ class TemplateEngine:
         if not timestamp_str:
             return timestamp_str
         try:
-            from datetime import datetime, timedelta
             # Parse ISO timestamp
             if timestamp_str.endswith('Z'):
-                dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+                dt = _parse_iso_timestamp(timestamp_str)
             elif '+' in timestamp_str or timestamp_str.count('-') > 2:
-                dt = datetime.fromisoformat(timestamp_str)
+                dt = _parse_iso_timestamp(timestamp_str)
             else:
-                dt = datetime.fromisoformat(timestamp_str + '+00:00')
+                dt = _parse_iso_timestamp(timestamp_str + '+00:00')
             # Add 1 second
             dt_plus_one = dt + timedelta(seconds=1)
             # Return in ISO format with Z
@@ -229,19 +655,19 @@ class TemplateEngine:
         """Normalize timestamp to CloudTrail format (YYYY-MM-DDTHH:MM:SSZ)"""
         try:
             if not timestamp:
-                return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+                return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
                 
             # Handle various timestamp formats
             dt = None
             
             # Try parsing ISO format with timezone
             if timestamp.endswith('Z'):
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                dt = _parse_iso_timestamp(timestamp)
             elif '+' in timestamp or timestamp.endswith('+00:00'):
-                dt = datetime.fromisoformat(timestamp)
+                dt = _parse_iso_timestamp(timestamp)
             else:
                 # Assume UTC if no timezone info
-                dt = datetime.fromisoformat(timestamp + '+00:00' if 'T' in timestamp else timestamp)
+                dt = _parse_iso_timestamp(timestamp + '+00:00' if 'T' in timestamp else timestamp)
             
             # Convert to UTC naive datetime and format for CloudTrail
             if dt.tzinfo is not None:
@@ -253,7 +679,7 @@ class TemplateEngine:
             
         except Exception as e:
             self.logger.warning(f"Could not normalize timestamp '{timestamp}': {e}")
-            return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+            return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
     
     def _extract_source_ip(self, entities: List[Dict[str, Any]]) -> Optional[str]:
         """Extract source IP from Azure alert entities"""
@@ -273,69 +699,37 @@ class TemplateEngine:
     
     def _format_severity(self, severity: str) -> str:
         """Standardize severity values"""
-        severity_map = {
-            'informational': 'Low',
-            'low': 'Low',
-            'medium': 'Medium',
-            'high': 'High',
-            'critical': 'Critical'
-        }
-        return severity_map.get(severity.lower() if severity else '', severity or 'Unknown')
+        return _SEVERITY_FORMAT_MAP.get(severity.lower() if severity else '', severity or 'Unknown')
     
     # OCSF-specific filter methods
     def _to_unix_timestamp(self, timestamp_str: str) -> int:
         """Convert timestamp to Unix epoch (milliseconds) for OCSF"""
         if not timestamp_str:
-            return int(datetime.utcnow().timestamp() * 1000)
+            return time.time_ns() // 1_000_000
         try:
-            if timestamp_str.endswith('Z'):
-                dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            else:
-                dt = datetime.fromisoformat(timestamp_str)
-            return int(dt.timestamp() * 1000)
+            return int(_parse_iso_timestamp(timestamp_str).timestamp() * 1000)
         except Exception as e:
             self.logger.warning(f"Could not parse timestamp '{timestamp_str}': {e}")
-            return int(datetime.utcnow().timestamp() * 1000)
+            return time.time_ns() // 1_000_000
     
     def _map_azure_severity_to_ocsf(self, severity: str) -> int:
         """Map Azure severity to OCSF severity ID"""
-        mapping = {
-            'Informational': 1,
-            'Low': 2, 
-            'Medium': 3,
-            'High': 4,
-            'Critical': 5
-        }
-        return mapping.get(severity, 99)  # 99 = Other/Unknown
+        return _AZURE_SEVERITY_TO_OCSF_ID.get(severity, 99)  # 99 = Other/Unknown
     
     def _map_alert_status(self, status: str) -> int:
         """Map Azure alert status to OCSF status ID"""
-        mapping = {
-            'New': 1,
-            'Active': 1,
-            'InProgress': 2,
-            'Dismissed': 3,
-            'Resolved': 4,
-            'Closed': 4
-        }
-        return mapping.get(status, 99)  # 99 = Other/Unknown
+        return _ALERT_STATUS_TO_OCSF_ID.get(status, 99)  # 99 = Other/Unknown
     
     def _map_confidence_level(self, level: str) -> int:
         """Map confidence level to OCSF confidence ID"""
-        mapping = {
-            'High': 3,
-            'Medium': 2,
-            'Low': 1,
-            'Unknown': 0
-        }
-        return mapping.get(level, 99)
+        return _CONFIDENCE_LEVEL_TO_OCSF_ID.get(level, 99)
     
     def _extract_subscription_id(self, resource_id: Union[str, List[str]]) -> str:
         """Extract subscription ID from Azure resource ID"""
         if isinstance(resource_id, list) and len(resource_id) > 0:
             resource_id = resource_id[0]
         if isinstance(resource_id, str) and '/subscriptions/' in resource_id:
-            return resource_id.split('/subscriptions/')[1].split('/')[0]
+            return resource_id.partition('/subscriptions/')[2].partition('/')[0]
         return 'unknown'
     
     def _extract_azure_region(self, resource_id: str) -> str:
@@ -348,15 +742,13 @@ class TemplateEngine:
         if not resource_path:
             return 'unknown'
         if '/' in resource_path:
-            return resource_path.split('/')[-1]
+            return resource_path.rpartition('/')[2]
         return resource_path
     
     def _extract_azure_resource_type(self, resource_id: str) -> str:
         """Extract Azure resource type from resource ID"""
         if isinstance(resource_id, str) and '/providers/' in resource_id:
-            parts = resource_id.split('/providers/')
-            if len(parts) > 1:
-                return parts[1].split('/')[0]
+            return resource_id.partition('/providers/')[2].partition('/')[0]
         return 'Subscription'
     
     def _extract_azure_subscription_from_resources(self, resource_identifiers: List[Dict[str, Any]]) -> str:
@@ -368,24 +760,12 @@ class TemplateEngine:
             if isinstance(resource, dict) and resource.get('Type') == 'AzureResource':
                 azure_resource_id = resource.get('AzureResourceId', '')
                 if '/subscriptions/' in azure_resource_id:
-                    return azure_resource_id.split('/subscriptions/')[1].split('/')[0]
+                    return azure_resource_id.partition('/subscriptions/')[2].partition('/')[0]
         return 'unknown'
     
     def _map_mitre_tactic(self, tactic_name: str) -> str:
         """Map Azure intent to MITRE tactic ID"""
-        mapping = {
-            'DefenseEvasion': 'TA0005',
-            'LateralMovement': 'TA0008',
-            'PrivilegeEscalation': 'TA0004',
-            'Persistence': 'TA0003',
-            'InitialAccess': 'TA0001',
-            'Execution': 'TA0002',
-            'Discovery': 'TA0007',
-            'Collection': 'TA0009',
-            'Exfiltration': 'TA0010',
-            'Impact': 'TA0040'
-        }
-        return mapping.get(tactic_name, 'TA0000')
+        return _MITRE_TACTIC_IDS.get(tactic_name, 'TA0000')
     
     def _extract_azure_tenant_from_resources(self, resource_identifiers: List[Dict[str, Any]]) -> str:
         """Extract Azure tenant ID from ResourceIdentifiers list"""
@@ -420,93 +800,46 @@ class TemplateEngine:
     def _calculate_compliance_severity_name(self, current_score: Union[int, float], max_score: Union[int, float]) -> str:
         """Calculate OCSF severity name from Azure compliance score"""
         severity_id = self._calculate_compliance_severity(current_score, max_score)
-        mapping = {
-            1: "Informational",
-            2: "Low",
-            3: "Medium",
-            4: "High",
-            5: "Critical"
-        }
-        return mapping.get(severity_id, "Medium")
+        return _COMPLIANCE_SEVERITY_NAMES.get(severity_id, "Medium")
     
     # ASFF-specific filter methods
     def _asff_severity_label(self, severity: str) -> str:
         """Convert Azure severity to ASFF severity label"""
-        severity_map = {
-            'informational': 'INFORMATIONAL',
-            'low': 'LOW',
-            'medium': 'MEDIUM',
-            'high': 'HIGH',
-            'critical': 'CRITICAL'
-        }
         if not severity or not isinstance(severity, str):
             return 'INFORMATIONAL'
-        return severity_map.get(severity.lower(), 'INFORMATIONAL')
+        return _ASFF_SEVERITY_LABELS.get(severity.lower(), 'INFORMATIONAL')
     
     def _asff_severity_normalized(self, severity: str) -> int:
         """Convert Azure severity to ASFF normalized score (0-100)"""
-        severity_map = {
-            'informational': 0,
-            'low': 30,
-            'medium': 60,
-            'high': 80,
-            'critical': 100
-        }
         if not severity or not isinstance(severity, str):
             return 0
-        return severity_map.get(severity.lower(), 0)
+        return _ASFF_SEVERITY_NORMALIZED.get(severity.lower(), 0)
     
     def _to_asff_types(self, alert_type: str) -> str:
         """Convert Azure alert type to ASFF Types array (returns JSON string)"""
         if not alert_type or not isinstance(alert_type, str):
-            return json.dumps(['Security Monitoring/Threat Detection'])
-        
-        # Map to MITRE ATT&CK-based types when possible
-        type_mapping = {
-            'Backdoor': 'TTPs/Defense Evasion',
-            'Malware': 'Effects/Data Exfiltration',
-            'Crypto': 'Effects/Resource Consumption',
-            'SQLInjection': 'TTPs/Initial Access',
-            'Phishing': 'TTPs/Initial Access',
-            'Brute': 'TTPs/Credential Access',
-            'Exploit': 'TTPs/Execution',
-            'Vulnerability': 'Software and Configuration Checks/Vulnerabilities'
-        }
+            return _ASFF_DEFAULT_TYPES
         
-        # Check if any key is in the alert type
-        for key, value in type_mapping.items():
-            if key.lower() in alert_type.lower():
-                return json.dumps([value])
+        # Map to MITRE ATT&CK-based types when any keyword is in the alert type
+        alert_type_lower = alert_type.lower()
+        for keyword, asff_types in _ASFF_TYPE_KEYWORDS:
+            if keyword in alert_type_lower:
+                return asff_types
         
         # Default to Security Monitoring category
-        return json.dumps(['Security Monitoring/Threat Detection'])
+        return _ASFF_DEFAULT_TYPES
     
     def _compliance_status(self, state: str) -> str:
         """Convert Azure compliance state to ASFF compliance status"""
         if not state or not isinstance(state, str):
             return 'FAILED'
-        
-        status_map = {
-            'passed': 'PASSED',
-            'pass': 'PASSED',
-            'failed': 'FAILED',
-            'fail': 'FAILED',
-            'not_applicable': 'NOT_APPLICABLE',
-            'notapplicable': 'NOT_APPLICABLE',
-            'unknown': 'UNKNOWN'
-        }
-        return status_map.get(state.lower(), 'FAILED')
+        return _ASFF_COMPLIANCE_STATUS.get(state.lower(), 'FAILED')
     
     def _asff_record_state(self, state: str) -> str:
         """Convert compliance/assessment state to ASFF RecordState"""
         if not state or not isinstance(state, str):
             return 'ACTIVE'
-        
-        state_upper = state.upper()
-        # ARCHIVED for passed/healthy states, ACTIVE for everything else
-        if state_upper in ['PASSED', 'PASS', 'HEALTHY']:
-            return 'ARCHIVED'
-        return 'ACTIVE'
+        return 'ARCHIVED' if state.upper() in _ASFF_ARCHIVED_STATES else 'ACTIVE'
     
     def _score_to_severity(self, current_score: Union[int, float, str], max_score: Union[int, float, str] = None) -> str:
         """Convert score to ASFF severity label"""
@@ -614,39 +947,8 @@ class TemplateEngine:
         if not state or not isinstance(state, str):
             return 'NOT_AVAILABLE'
         
-        state_lower = state.lower()
-        
         # Map Azure compliance states to Security Hub ReasonCode
-        reason_code_map = {
-            # Pass states
-            'passed': 'PASSED',
-            'pass': 'PASSED',
-            'healthy': 'PASSED',
-            'compliant': 'PASSED',
-            
-            # Fail states
-            'failed': 'FAILED',
-            'fail': 'FAILED',
-            'unhealthy': 'FAILED',
-            'non-compliant': 'FAILED',
-            'noncompliant': 'FAILED',
-            
-            # Warning states
-            'warning': 'WARNING',
-            'degraded': 'WARNING',
-            
-            # Not available states
-            'not_applicable': 'NOT_AVAILABLE',
-            'notapplicable': 'NOT_AVAILABLE',
-            'unknown': 'NOT_AVAILABLE',
-            'pending': 'NOT_AVAILABLE',
-            
-            # No data states
-            'nodata': 'NO_DATA_AVAILABLE',
-            'no_data': 'NO_DATA_AVAILABLE'
-        }
-        
-        return reason_code_map.get(state_lower, 'NOT_AVAILABLE')
+        return _ASFF_REASON_CODES.get(state.lower(), 'NOT_AVAILABLE')
     
     def _is_valid_value(self, value: Any) -> bool:
         """Check if a value is valid (not None, empty, or the string 'None')"""
@@ -702,7 +1004,7 @@ class TemplateEngine:
         # Handle IPv4 with port (single colon)
         # Count colons - if only one, it's IPv4:port
         if address.count(':') == 1:
-            return address.split(':')[0]
+            return address.partition(':')[0]
         
         # Multiple colons without brackets = pure IPv6 without port
         return address
@@ -736,10 +1038,11 @@ class TemplateEngine:
             return None
         
         # Handle IPv4 with port (single colon)
-        if address.count(':') == 1:
+        port_part = address.partition(':')[2]
+        if ':' not in port_part:
             try:
-                return int(address.split(':')[1])
-            except (ValueError, IndexError):
+                return int(port_part)
+            except ValueError:
                 return None
         
         # Multiple colons without brackets = pure IPv6, no port
@@ -758,19 +1061,10 @@ class TemplateEngine:
         if not status_code or not isinstance(status_code, str):
             return 'Unknown'
         
-        status_mapping = {
-            'healthy': 'Pass',
-            'unhealthy': 'Fail',
-            'notapplicable': 'Skip',
-            'not_applicable': 'Skip',
-            'unknown': 'Unknown',
-            # Additional status codes that might appear
-            'low': 'Pass',
-            'medium': 'Fail',
-            'high': 'Fail',
-            'critical': 'Fail',
-        }
-        return status_mapping.get(status_code.lower(), 'Unknown')
+        status = _OCSF_COMPLIANCE_STATUS.get(status_code)
+        if status is None:
+            status = _OCSF_COMPLIANCE_STATUS.get(status_code.lower(), 'Unknown')
+        return status
     
     def _map_compliance_status_id(self, status_code: str) -> int:
         """
@@ -791,19 +1085,10 @@ class TemplateEngine:
         if not status_code or not isinstance(status_code, str):
             return 99  # Unknown
         
-        status_id_mapping = {
-            'healthy': 1,       # Pass
-            'unhealthy': 2,     # Fail
-            'notapplicable': 3, # Skip
-            'not_applicable': 3, # Skip
-            'unknown': 99,      # Unknown
-            # Additional status codes that might appear
-            'low': 1,           # Pass (low severity = acceptable)
-            'medium': 2,        # Fail
-            'high': 2,          # Fail
-            'critical': 2,      # Fail
-        }
-        return status_id_mapping.get(status_code.lower(), 99)
+        status_id = _OCSF_COMPLIANCE_STATUS_ID.get(status_code)
+        if status_id is None:
+            status_id = _OCSF_COMPLIANCE_STATUS_ID.get(status_code.lower(), 99)
+        return status_id
     
     def _slugify(self, text: Any) -> str:
         """
@@ -826,20 +1111,7 @@ class TemplateEngine:
         if not text.strip():
             return ''
         
-        # Convert to lowercase
-        slug = text.lower()
-        
-        # Replace spaces and special characters with hyphens
-        # Keep only alphanumeric characters and hyphens
-        slug = re.sub(r'[^a-z0-9]+', '-', slug)
-        
-        # Remove leading/trailing hyphens
-        slug = slug.strip('-')
-        
-        # Remove consecutive hyphens
-        slug = re.sub(r'-+', '-', slug)
-        
-        return slug
+        return _slugify_text(text)
     
     def _json_escape_string(self, text: str) -> str:
         """
@@ -855,33 +1127,64 @@ class TemplateEngine:
         if not text or not isinstance(text, str):
             return ''
         
-        # Use json.dumps to properly escape, then remove the surrounding quotes
+        # Use the C string encoder behind json.dumps, then remove the surrounding quotes
         # This handles all control characters: \n, \r, \t, etc.
-        escaped = json.dumps(text)[1:-1]  # Remove leading and trailing quotes
-        return escaped
+        return encode_basestring_ascii(text)[1:-1]  # Remove leading and trailing quotes
     
-    def render_template(self, template_str: str, context: Dict[str, Any]) -> str:
-        """Render Jinja2 template with given context"""
+    def get_compiled_template(self, template_str: str, filters: Optional[Dict[str, callable]] = None):
+        """
+        Compile a Jinja2 template source once and reuse it for subsequent renders
+        
+        Template-specific filters are bound to an overlay of the shared environment, so
+        they cannot leak into (or override built-in filters for) other templates. The cache
+        is keyed by source and filters, as the same source may be bound to different filters.
+        """
+        cache_key = (template_str, frozenset(filters.items()) if filters else None)
+        template = self._compiled_templates.get(cache_key)
+        if template is None:
+            env = self.env
+            if filters:
+                env = self.env.overlay()
+                env.filters = {**self.env.filters, **filters}
+            template = env.from_string(template_str)
+            self._compiled_templates[cache_key] = template
+        return template
+    
+    def render_template(self, template_str: str, context: Dict[str, Any],
+                        filters: Optional[Dict[str, callable]] = None) -> str:
+        """Render Jinja2 template with given context and optional template-specific filters"""
         try:
             if self.env is None:
                 raise ImportError("Jinja2 not available")
             
-            # DEBUG: Log template rendering start
-            self.logger.debug(f"JINJA2 DEBUG - Starting template render with {len(context)} context keys")
+            template = self.get_compiled_template(template_str, filters)
             
-            template = self.env.from_string(template_str)
-            
-            # DEBUG: Log specific extractors that are commonly problematic
-            extractors = context.get('extractors', {})
-            problematic_fields = ['time_generated', 'start_time_utc', 'end_time_utc', 'intent', 'entities', 'resource_identifiers']
-            for field in problematic_fields:
-                value = extractors.get(field)
-                self.logger.debug(f"JINJA2 DEBUG - {field}: {repr(value)} (type: {type(value).__name__})")
+        except Exception as e:
+            self.logger.error(f"Template rendering failed: {str(e)}")
+            raise TemplateError(f"Template rendering failed: {str(e)}")
+        
+        return self.render_compiled(template, context)
+    
+    def render_compiled(self, template, context: Dict[str, Any]) -> str:
+        """Render an already compiled Jinja2 template with given context"""
+        try:
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                # DEBUG: Log template rendering start
+                self.logger.debug(f"JINJA2 DEBUG - Starting template render with {len(context)} context keys")
+                
+                # DEBUG: Log specific extractors that are commonly problematic
+                extractors = context.get('extractors', {})
+                problematic_fields = ['time_generated', 'start_time_utc', 'end_time_utc', 'intent', 'entities', 'resource_identifiers']
+                for field in problematic_fields:
+                    value = extractors.get(field)
+                    self.logger.debug(f"JINJA2 DEBUG - {field}: {repr(value)} (type: {type(value).__name__})")
             
             rendered = template.render(**context)
             
-            # DEBUG: Log rendered template summary (single-line for CloudWatch compatibility)
-            self.logger.debug(f"JINJA2 DEBUG - Rendered template: {len(rendered)} chars")
+            if debug_enabled:
+                # DEBUG: Log rendered template summary (single-line for CloudWatch compatibility)
+                self.logger.debug(f"JINJA2 DEBUG - Rendered template: {len(rendered)} chars")
             
             return rendered
             
@@ -890,6 +1193,21 @@ class TemplateEngine:
             raise TemplateError(f"Template rendering failed: {str(e)}")
 
 
+@lru_cache(maxsize=256)
+def _compile_filter_code(filter_name: str, filter_code: str):
+    """Compile a template filter's Python source to a code object (named after the filter in tracebacks)"""
+    return compile(filter_code, f'<filter:{filter_name}>', 'exec')
+
+
+# Template filter functions keyed by their filter source - exec'd once per container, not per load
+_TEMPLATE_FILTER_FUNCTIONS: Dict[Tuple[Tuple[str, str], ...], Dict[str, callable]] = {}
+
+# Shared extractor and engine - built once per Lambda container at import and reused by every
+# TemplateTransformer, so the Jinja2 environment, filters and compiled templates outlive a mapper
+JSONPATH_EXTRACTOR = JSONPathExtractor()
+TEMPLATE_ENGINE = TemplateEngine()
+
+
 class TemplateTransformer:
     """
     Main template-driven transformation engine
@@ -901,13 +1219,16 @@ class TemplateTransformer:
         self.logger = logger or logging.getLogger(__name__)
         self.event_type_mappings = event_type_mappings
         
-        # Initialize components
-        self.jsonpath_extractor = JSONPathExtractor(logger=self.logger)
-        self.template_engine = TemplateEngine(logger=self.logger)
+        # Initialize components (shared module-level instances)
+        self.jsonpath_extractor = JSONPATH_EXTRACTOR
+        self.template_engine = TEMPLATE_ENGINE
         
         # Template cache for Lambda performance
         self._template_cache = {}
         self._loaded_templates = {}
+        
+        # AWS region from environment or default (constant for the life of the container)
+        self._aws_region = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
     
     def transform_event(self, azure_event: Dict[str, Any], aws_account_id: str,
                        event_type: str, output_format: str = 'cloudtrail') -> Optional[Union[CloudTrailAuditEvent, Dict[str, Any]]]:
@@ -937,74 +1258,38 @@ class TemplateTransformer:
             event_config = self.event_type_mappings.get(event_type, {})
             
             # Build template context
-            # Get AWS region from environment or default
-            aws_region = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
-            
             context = {
                 'extractors': extracted_data,
                 'config': event_config,
                 'aws_account_id': aws_account_id,
-                'aws_region': aws_region,
+                'aws_region': self._aws_region,
                 'event_type': event_type,
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': datetime.now(timezone.utc).isoformat() if template.uses_timestamp else None,
                 'azure_event': azure_event,  # For Azure template compatibility
                 'gcp_event': azure_event,  # For GCP template compatibility (same event, different name)
-                'generate_uuid': lambda: str(uuid.uuid4())  # Add as function, not filter
+                'generate_uuid': _generate_uuid  # Add as function, not filter
             }
             
-            # Register template-specific filters if defined
-            if template.filters:
-                self._register_template_filters(template.filters)
+            # Render template (compiled with its template-specific filters when loaded)
+            if template.compiled is None:
+                raise TemplateError(f"Template {template.name} is not compiled")
+            rendered_json = self.template_engine.render_compiled(template.compiled, context)
             
-            # Render template
-            rendered_json = self.template_engine.render_template(template.template, context)
-            
-            # DEBUG: Log extracted data summary (single-line, no indent for CloudWatch compatibility)
-            self.logger.debug(f"TEMPLATE DEBUG - Extracted data for {event_type}: {json.dumps(extracted_data, default=str)}")
-            
-            # DEBUG: Log template rendering context (single-line, no indent)
-            context_debug = {k: v for k, v in context.items() if k != 'azure_event'}  # Exclude raw event for brevity
-            self.logger.debug(f"TEMPLATE DEBUG - Template context: {json.dumps(context_debug, default=str)}")
+            # Serializing the debug payloads costs more than the render itself - only pay it when logged
+            if self.logger.isEnabledFor(logging.DEBUG):
+                # DEBUG: Log extracted data summary (single-line, no indent for CloudWatch compatibility)
+                self.logger.debug(f"TEMPLATE DEBUG - Extracted data for {event_type}: {json.dumps(extracted_data, default=str)}")
+                
+                # DEBUG: Log template rendering context (single-line, no indent)
+                context_debug = {k: v for k, v in context.items() if k != 'azure_event'}  # Exclude raw event for brevity
+                self.logger.debug(f"TEMPLATE DEBUG - Template context: {json.dumps(context_debug, default=str)}")
             
             # Parse rendered JSON
             try:
-                result_data = json.loads(rendered_json)
+                result_data = _parse_rendered_json(rendered_json)
                 self.logger.debug(f"Successfully parsed JSON with {len(result_data)} top-level fields")
             except json.JSONDecodeError as e:
-                self.logger.error(f"Failed to parse rendered template JSON: {str(e)}")
-                
-                # Enhanced debugging for JSON parsing failures
-                lines = rendered_json.split('\n')
-                error_line_num = getattr(e, 'lineno', 1) - 1
-                error_col = getattr(e, 'colno', 1) - 1
-                
-                self.logger.error(f"JSON ERROR at line {error_line_num + 1}, column {error_col + 1}")
-                
-                # Show context around error line
-                start_line = max(0, error_line_num - 3)
-                end_line = min(len(lines), error_line_num + 4)
-                
-                self.logger.error("JSON CONTEXT AROUND ERROR:")
-                for i in range(start_line, end_line):
-                    marker = " >>> " if i == error_line_num else "     "
-                    line_content = lines[i] if i < len(lines) else ''
-                    self.logger.error(f"{marker}Line {i+1:3}: {line_content}")
-                    
-                    # Show character position for error line
-                    if i == error_line_num:
-                        pointer = ' ' * (error_col + 10) + '^'  # 10 chars for line number prefix
-                        self.logger.error(f"     Col {error_col+1:3}: {pointer}")
-                
-                # Also log full template for complete debugging (truncated for CloudWatch compatibility)
-                self.logger.debug(f"FULL RENDERED TEMPLATE (first 1000 chars): {rendered_json[:1000]}...")
-                
-                # Show specific character around error position
-                char_start = max(0, 5394 - 100)
-                char_end = min(len(rendered_json), 5394 + 100)
-                error_context = rendered_json[char_start:char_end]
-                error_pos = 5394 - char_start
-                self.logger.debug(f"CHARACTER CONTEXT (±100 chars around error pos {5394}):")
-                self.logger.debug(f"'{error_context[:error_pos]}' >>> ERROR HERE >>> '{error_context[error_pos:]}'")
+                self._log_json_parse_error(e, rendered_json)
                 raise
             
             # Log basic success without detailed template output
@@ -1045,7 +1330,7 @@ class TemplateTransformer:
                 # Azure resource ID is preserved in the eventData/additionalEventData section
                 cloudtrail_event_id = str(uuid.uuid4())
                 return CloudTrailAuditEvent(
-                    eventData=json.dumps(result_data.get('eventData', result_data)),
+                    eventData=_json_dumps(result_data.get('eventData', result_data)),
                     id=cloudtrail_event_id
                 )
             
@@ -1056,16 +1341,73 @@ class TemplateTransformer:
             )
             return None
     
-    def _register_template_filters(self, filters_dict: Dict[str, str]) -> None:
+    def _log_json_parse_error(self, e: json.JSONDecodeError, rendered_json: str):
+        """Log where rendered template output failed to parse as JSON"""
+        self.logger.error(f"Failed to parse rendered template JSON: {str(e)}")
+        
+        # Enhanced debugging for JSON parsing failures
+        lines = rendered_json.split('\n')
+        error_line_num = getattr(e, 'lineno', 1) - 1
+        error_col = getattr(e, 'colno', 1) - 1
+        
+        self.logger.error(f"JSON ERROR at line {error_line_num + 1}, column {error_col + 1}")
+        
+        # Show context around error line
+        start_line = max(0, error_line_num - 3)
+        end_line = min(len(lines), error_line_num + 4)
+        
+        self.logger.error("JSON CONTEXT AROUND ERROR:")
+        for i in range(start_line, end_line):
+            marker = " >>> " if i == error_line_num else "     "
+            line_content = lines[i] if i < len(lines) else ''
+            self.logger.error(f"{marker}Line {i+1:3}: {line_content}")
+            
+            # Show character position for error line
+            if i == error_line_num:
+                pointer = ' ' * (error_col + 10) + '^'  # 10 chars for line number prefix
+                self.logger.error(f"     Col {error_col+1:3}: {pointer}")
+        
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        # Also log full template for complete debugging (truncated for CloudWatch compatibility)
+        self.logger.debug(f"FULL RENDERED TEMPLATE (first 1000 chars): {rendered_json[:1000]}...")
+        
+        # Show specific character around error position
+        error_offset = getattr(e, 'pos', 0)
+        char_start = max(0, error_offset - 100)
+        char_end = min(len(rendered_json), error_offset + 100)
+        error_context = rendered_json[char_start:char_end]
+        error_pos = error_offset - char_start
+        self.logger.debug(f"CHARACTER CONTEXT (±100 chars around error pos {error_offset}):")
+        self.logger.debug(f"'{error_context[:error_pos]}' >>> ERROR HERE >>> '{error_context[error_pos:]}'")
+    
+    def _compile_template(self, template: TransformationTemplate):
+        """Compile a template's Jinja2 source together with its template-specific filters"""
+        if self.template_engine.env is None:
+            raise ImportError("Jinja2 not available")
+        template_filters = self._load_template_filters(template.filters) if template.filters else None
+        return self.template_engine.get_compiled_template(template.template, template_filters)
+    
+    def _load_template_filters(self, filters_dict: Dict[str, str]) -> Dict[str, callable]:
         """
-        Dynamically register template-specific filters with Jinja2 environment
+        Dynamically load template-specific filters for the template's Jinja2 environment
         Supports filter inter-dependencies by executing all filters in shared namespace
         
         Args:
             filters_dict: Dictionary of filter_name -> filter_code from template
+            
+        Returns:
+            Dictionary of filter_name -> filter function for successfully loaded filters
         """
+        template_filters = {}
         if not filters_dict or not self.template_engine.env:
-            return
+            return template_filters
+        
+        cache_key = tuple(filters_dict.items())
+        cached_filters = _TEMPLATE_FILTER_FUNCTIONS.get(cache_key)
+        if cached_filters is not None:
+            return cached_filters
         
         try:
             # Create shared execution namespace for all filters
@@ -1085,7 +1427,7 @@ class TemplateTransformer:
             # Execute all filter code in shared namespace to support inter-dependencies
             for filter_name, filter_code in filters_dict.items():
                 try:
-                    exec(filter_code, exec_globals, exec_locals)
+                    exec(_compile_filter_code(filter_name, filter_code), exec_globals, exec_locals)
                     
                     # Verify function was defined
                     if filter_name in exec_locals:
@@ -1099,27 +1441,39 @@ class TemplateTransformer:
             # This allows filter functions to call other filter functions (interdependencies)
             exec_globals.update(exec_locals)
             
-            # Now register all successfully executed filters with Jinja2
+            # Now collect all successfully executed filters for Jinja2
             for filter_name in filters_dict.keys():
                 if filter_name in exec_locals:
-                    filter_func = exec_locals[filter_name]
-                    self.template_engine.env.filters[filter_name] = filter_func
-                    self.logger.debug(f"Registered template filter: {filter_name}")
+                    template_filters[filter_name] = exec_locals[filter_name]
+                    self.logger.debug(f"Loaded template filter: {filter_name}")
+            
+            _TEMPLATE_FILTER_FUNCTIONS[cache_key] = template_filters
                     
         except Exception as e:
-            self.logger.error(f"Failed to register template filters: {str(e)}")
+            self.logger.error(f"Failed to load template filters: {str(e)}")
+        
+        return template_filters
     
     def _extract_template_data(self, azure_event: Dict[str, Any], 
                               template: TransformationTemplate) -> Dict[str, Any]:
         """Extract data from Azure event using template's JSONPath expressions"""
         extracted = {}
         
+        field_paths = template.field_paths or {}
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        
         for field_name, jsonpath_expr in template.extractors.items():
             try:
-                value = self.jsonpath_extractor.extract(azure_event, jsonpath_expr)
+                # Plain field paths were resolved to key tuples when the template was loaded
+                field_path = field_paths.get(field_name)
+                if field_path is not None:
+                    value = _resolve_field_path(azure_event, field_path)
+                else:
+                    value = self.jsonpath_extractor.extract(azure_event, jsonpath_expr)
                 extracted[field_name] = value
                 
-                self.logger.debug(f"Extracted {field_name}: {value}")
+                if debug_enabled:
+                    self.logger.debug(f"Extracted {field_name}: {value}")
                 
             except Exception as e:
                 self.logger.warning(f"Failed to extract {field_name} using '{jsonpath_expr}': {str(e)}")
@@ -1127,6 +1481,29 @@ class TemplateTransformer:
         
         return extracted
     
+    def _build_field_paths(self, extractors: Dict[str, str]) -> Dict[str, Tuple[str, ...]]:
+        """Map extractor fields with plain field paths to their key tuples (others use jsonpath-ng)"""
+        field_paths = {}
+        for field_name, jsonpath_expr in extractors.items():
+            try:
+                field_path = _plain_field_path(jsonpath_expr)
+            except Exception:
+                continue
+            if field_path is not None:
+                field_paths[field_name] = field_path
+        return field_paths
+    
+    def _references_variable(self, template: TransformationTemplate, name: str) -> bool:
+        """Whether a compiled template reads a context variable (assumed True if it cannot be analyzed)"""
+        if meta is None or template.compiled is None:
+            return True
+        try:
+            # Parse with the template's own environment so its custom filters resolve
+            ast = template.compiled.environment.parse(template.template)
+            return name in meta.find_undeclared_variables(ast)
+        except Exception:
+            return True
+    
     def _load_template(self, event_type: str, output_format: str = 'cloudtrail') -> Optional[TransformationTemplate]:
         """Load transformation template for event type and format (with caching)"""
         cache_key = f"{event_type}_{output_format}"
@@ -1142,13 +1519,8 @@ class TemplateTransformer:
             self.logger.debug(f"Template explicitly disabled (null) for {event_type} ({output_format})")
             return None
         
-        if not os.path.exists(template_path):
-            self.logger.warning(f"Template file not found: {template_path}")
-            return None
-        
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_data = yaml.safe_load(f)
+            template_data = _read_template_file(template_path)
             
             template = TransformationTemplate(
                 name=template_data['name'],
@@ -1160,21 +1532,30 @@ class TemplateTransformer:
                 conditionals=template_data.get('conditionals')
             )
             
+            template.field_paths = self._build_field_paths(template.extractors)
+            
+            # Compile once per load - every event rendered from this template reuses it
+            try:
+                template.compiled = self._compile_template(template)
+            except Exception as e:
+                self.logger.error(f"Failed to compile template for {event_type} ({output_format}): {str(e)}")
+            template.uses_timestamp = self._references_variable(template, 'timestamp')
+            
             # Cache the loaded template
             self._loaded_templates[cache_key] = template
             
             self.logger.info(f"Loaded transformation template: {template.name} ({output_format})")
             return template
             
+        except FileNotFoundError:
+            self.logger.warning(f"Template file not found: {template_path}")
+            return None
         except Exception as e:
             self.logger.error(f"Failed to load template for {event_type} ({output_format}): {str(e)}")
             return None
     
     def _get_template_path(self, event_type: str, output_format: str = 'cloudtrail') -> Optional[str]:
         """Get file path for transformation template using mapping configuration"""
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        templates_dir = os.path.join(current_dir, '..', 'templates')
-        
         # Get template filename from mapping configuration
         event_config = self.event_type_mappings.get(event_type, {})
         template_key = f'{output_format}_template'
@@ -1189,26 +1570,14 @@ class TemplateTransformer:
             if not isinstance(template_filename, str) or not template_filename:
                 self.logger.warning(f"Invalid template filename for {event_type} ({output_format}): {template_filename}")
                 return None
-            return os.path.join(templates_dir, template_filename)
+            return os.path.join(TEMPLATES_DIR, template_filename)
         
         # Fallback to constructed filename if not in mapping
-        return os.path.join(templates_dir, f'{event_type}_{output_format}.yaml')
+        return os.path.join(TEMPLATES_DIR, f'{event_type}_{output_format}.yaml')
     
     def get_supported_templates(self, output_format: str = 'cloudtrail') -> List[str]:
         """Get list of available transformation templates for given format"""
-        templates_dir = os.path.join(os.path.dirname(__file__), '..', 'templates')
-        if not os.path.exists(templates_dir):
-            return []
-        
-        templates = []
-        suffix = f'_{output_format}.yaml'
-        
-        for filename in os.listdir(templates_dir):
-            if filename.endswith(suffix):
-                event_type = filename.replace(suffix, '')
-                templates.append(event_type)
-        
-        return templates
+        return list(_supported_templates(output_format))
     
     def get_all_supported_templates(self) -> Dict[str, List[str]]:
         """Get all available templates grouped by output format"""
@@ -1256,7 +1625,7 @@ class TemplateTransformer:
             # Validate Jinja2 template syntax
             if self.template_engine.env:
                 try:
-                    compiled_template = self.template_engine.env.from_string(template.template)
+                    compiled_template = self._compile_template(template)
                     
                     # Test template with mock data to catch runtime errors
                     mock_context = {
@@ -1372,33 +1741,21 @@ class TemplateTransformer:
             expected_class_info = OCSF_CLASS_DICTIONARY[version][class_uid]
             
             # Step 4: Validate class consistency (from validate.py lines 565-576)
-            if 'class_name' in ocsf_event:
-                if ocsf_event['class_name'] != expected_class_info['class_name']:
+            for field, label in _OCSF_CLASS_CONSISTENCY_FIELDS:
+                value = ocsf_event.get(field, _NOT_SET)
+                if value is not _NOT_SET and value != expected_class_info[field]:
                     validation_result['errors'].append(
-                        f"The input contains the 'class name' value: {ocsf_event['class_name']}. "
-                        f"Using OCSF class uid {class_uid} requires the 'class name' value: {expected_class_info['class_name']}"
-                    )
-            
-            if 'category_name' in ocsf_event:
-                if ocsf_event['category_name'] != expected_class_info['category_name']:
-                    validation_result['errors'].append(
-                        f"The input contains the 'category name' value: {ocsf_event['category_name']}. "
-                        f"Using OCSF class uid {class_uid} requires the 'category name' value: {expected_class_info['category_name']}"
-                    )
-            
-            if 'category_uid' in ocsf_event:
-                if ocsf_event['category_uid'] != expected_class_info['category_uid']:
-                    validation_result['errors'].append(
-                        f"The input contains the 'category uid' value: {ocsf_event['category_uid']}. "
-                        f"Using OCSF class uid {class_uid} requires the 'category uid' value: {expected_class_info['category_uid']}"
+                        f"The input contains the '{label}' value: {value}. "
+                        f"Using OCSF class uid {class_uid} requires the '{label}' value: {expected_class_info[field]}"
                     )
             
             # Step 5: Add deprecation warnings
-            if class_uid == '2001':
-                validation_result['warnings'].append("OCSF event class: Security Findings (2001) is deprecated!")
+            deprecation_warning = _OCSF_DEPRECATED_CLASSES.get(class_uid)
+            if deprecation_warning:
+                validation_result['warnings'].append(deprecation_warning)
             
             # Step 6: Validate against official OCSF schema (if jsonschema available)
-            if JSONSCHEMA_AVAILABLE and jsonschema:
+            if _load_jsonschema():
                 schema_validation = self._validate_against_ocsf_schema(ocsf_event, expected_class_info, version, profiles)
                 validation_result['errors'].extend(schema_validation.get('errors', []))
                 validation_result['warnings'].extend(schema_validation.get('warnings', []))
@@ -1433,15 +1790,15 @@ class TemplateTransformer:
         
         try:
             # Clean event data (remove None values)
-            cleaned_event = self._recursive_filter(ocsf_event, None, 'None')
+            cleaned_event = self._recursive_filter(ocsf_event, _OCSF_FILTERED_VALUES)
             
             # Basic structural checks without downloading schemas
             
-            # Check for basic required OCSF fields
-            required_fields = ['version', 'class_uid', 'category_uid', 'activity_id', 'time']
-            for field in required_fields:
-                if field not in cleaned_event:
-                    schema_validation['errors'].append(f"Missing required OCSF field: {field}")
+            # Check for basic required OCSF fields (one C-level subset test; per-field errors only when missing)
+            if not cleaned_event.keys() >= _OCSF_REQUIRED_FIELD_SET:
+                for field in _OCSF_REQUIRED_FIELDS:
+                    if field not in cleaned_event:
+                        schema_validation['errors'].append(f"Missing required OCSF field: {field}")
             
             self.logger.debug("OCSF event passed basic structural validation (no external schema download)")
             
@@ -1451,18 +1808,75 @@ class TemplateTransformer:
             schema_validation['errors'].append(f"Exception during basic schema validation: {str(e)}")
             return schema_validation
     
-    def _recursive_filter(self, item, *forbidden):
+    def _recursive_filter(self, item, forbidden: frozenset):
         """
-        Recursively remove forbidden values from JSON object
+        Remove forbidden values (and keys) from a JSON object at every nesting level
         (From Amazon Security Lake validator lines 483-501)
+        
+        Walks the structure with an explicit stack rather than recursion: each container
+        is copied into its filtered placeholder in the parent, so deep events cannot hit
+        the recursion limit.
         """
-        if isinstance(item, list):
-            return [self._recursive_filter(entry, *forbidden) for entry in item if entry not in forbidden]
-        if isinstance(item, dict):
-            result = {}
-            for (key, value) in item.items():
-                value = self._recursive_filter(value, *forbidden)
-                if key not in forbidden and value not in forbidden:
-                    result[key] = value
-            return result
-        return item
\ No newline at end of file
+        if not isinstance(item, (dict, list)):
+            return item
+        
+        root = [None]
+        stack = [(root, 0, item)]
+        while stack:
+            parent, position, node = stack.pop()
+            if isinstance(node, dict):
+                result = {}
+                for key, value in node.items():
+                    if key in forbidden:
+                        continue
+                    if isinstance(value, (dict, list)):
+                        result[key] = None
+                        stack.append((result, key, value))
+                    elif value not in forbidden:
+                        result[key] = value
+            else:
+                result = []
+                for value in node:
+                    if isinstance(value, (dict, list)):
+                        result.append(None)
+                        stack.append((result, len(result) - 1, value))
+                    elif value not in forbidden:
+                        result.append(value)
+            parent[position] = result
+        return root[0]
+
+
+def precompile_templates(templates_dir: str = TEMPLATES_DIR, logger: Optional[logging.Logger] = None) -> int:
+    """
+    Pre-compile the Jinja2 template of every template file into the shared TEMPLATE_ENGINE
+    
+    Intended to run during Lambda init (outside the handler). Each template is compiled
+    with its custom filters, as transform_event does.
+    
+    Args:
+        templates_dir: Directory containing YAML transformation templates
+        logger: Logger instance
+        
+    Returns:
+        Number of templates compiled
+    """
+    logger = logger or logging.getLogger(__name__)
+    if TEMPLATE_ENGINE.env is None:
+        return 0
+    
+    transformer = TemplateTransformer({}, logger=logger)
+    compiled = 0
+    
+    for filename in sorted(os.listdir(templates_dir)):
+        if not filename.endswith(('.yaml', '.yml')):
+            continue
+        try:
+            template_data = _read_template_file(os.path.join(templates_dir, filename))
+            template_filters = transformer._load_template_filters(template_data['filters']) if template_data.get('filters') else None
+            TEMPLATE_ENGINE.get_compiled_template(template_data['template'], template_filters)
+            compiled += 1
+        except Exception as e:
+            logger.warning(f"Failed to pre-compile template {filename}: {str(e)}")
+    
+    logger.info(f"Pre-compiled {compiled} Jinja2 templates")
+    return compiled
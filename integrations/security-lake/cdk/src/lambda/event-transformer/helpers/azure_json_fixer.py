@@ -15,6 +15,30 @@ import re
 import logging
 from typing import Dict, Any, Optional, Tuple
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Malformation patterns - compiled once at import
+_DOUBLE_OPEN_BRACE_PATTERN = re.compile(r'("event_data":\s*){{')
+_ANCHOR_TAG_PATTERN = re.compile(r'<a\s+[^>]+>')
+_DOUBLE_QUOTED_ATTRIBUTE_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+
+def _loads(json_string: str) -> Any:
+    """Parse a JSON string (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity literals, out-of-range numbers, ... - the stdlib parser
+            # accepts these or raises the error reported to the caller
+            pass
+    return json.loads(json_string)
+
 
 def fix_azure_json(json_string: str, logger: Optional[logging.Logger] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
     """
@@ -34,26 +58,32 @@ def fix_azure_json(json_string: str, logger: Optional[logging.Logger] = None) ->
     
     # Try parsing original first
     try:
-        return json.loads(json_string), None
+        return _loads(json_string), None
     except json.JSONDecodeError as original_error:
         logger.warning("Initial JSON parse failed, attempting to fix common Azure malformations")
         
         # Apply fixes
         fixed_body = _apply_all_fixes(json_string, logger)
         
+        # No known malformation was found - the fixed body would fail exactly as the original did
+        if fixed_body == json_string:
+            logger.error(f"JSON parsing failed and no known Azure malformations were found: {original_error}")
+            return None, original_error
+        
         # Try parsing fixed version
         try:
-            parsed = json.loads(fixed_body)
+            parsed = _loads(fixed_body)
             logger.info("Successfully parsed JSON after applying Azure malformation fixes")
             return parsed, None
         except json.JSONDecodeError as fix_error:
             logger.error(f"JSON parsing failed even after applying fixes")
             logger.error(f"Original error: {original_error}")
             logger.error(f"After fix error: {fix_error}")
-            logger.debug(f"Original snippet (first 200 chars): {json_string[:200]}")
-            logger.debug(f"Original snippet (last 200 chars): {json_string[-200:]}")
-            logger.debug(f"Fixed snippet (first 200 chars): {fixed_body[:200]}")
-            logger.debug(f"Fixed snippet (last 200 chars): {fixed_body[-200:]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Original snippet (first 200 chars): {json_string[:200]}")
+                logger.debug(f"Original snippet (last 200 chars): {json_string[-200:]}")
+                logger.debug(f"Fixed snippet (first 200 chars): {fixed_body[:200]}")
+                logger.debug(f"Fixed snippet (last 200 chars): {fixed_body[-200:]}")
             
             # Log exact error location
             if fix_error.pos < len(fixed_body):
@@ -106,14 +136,12 @@ def _fix_double_braces(text: str, logger: logging.Logger) -> str:
     Returns:
         Fixed JSON string
     """
-    # Check if we have double opening braces
-    has_double_open = bool(re.search(r'("event_data":\s*){{', text))
+    # Fix opening double braces: "event_data": {{ -> "event_data": {
+    fixed, double_open_count = _DOUBLE_OPEN_BRACE_PATTERN.subn(r'\1{', text)
     
-    if not has_double_open:
+    if not double_open_count:
         return text
     
-    # Fix opening double braces: "event_data": {{ -> "event_data": {
-    fixed = re.sub(r'("event_data":\s*){{', r'\1{', text)
     logger.debug("Fixed double opening braces")
     
     # Balance braces by counting total opening and closing braces
@@ -123,8 +151,10 @@ def _fix_double_braces(text: str, logger: logging.Logger) -> str:
     if close_count > open_count:
         # Remove extra closing braces from the end
         extra_braces = close_count - open_count
-        # Count consecutive closing braces at end
-        trailing_closes = len(fixed) - len(fixed.rstrip('}'))
+        # Count consecutive closing braces at end (scan back rather than copying via rstrip)
+        trailing_closes = 0
+        while trailing_closes < len(fixed) and fixed[-1 - trailing_closes] == '}':
+            trailing_closes += 1
         
         if extra_braces <= trailing_closes:
             # Remove exactly the number of extra braces from the end
@@ -189,19 +219,27 @@ def _fix_html_anchor_quotes(text: str, logger: logging.Logger) -> str:
     Returns:
         Fixed JSON string
     """
-    anchor_count = 0
-    
     def fix_single_tag(match):
-        nonlocal anchor_count
-        anchor_count += 1
-        tag = match.group(0)
         # Within this isolated tag, convert all attribute="value" to attribute='value'
-        fixed_tag = re.sub(r'(\w+)="([^"]*)"', r"\1='\2'", tag)
-        logger.debug(f"Fixed anchor tag #{anchor_count}: {repr(tag[:50])} -> {repr(fixed_tag[:50])}")
-        return fixed_tag
+        return _DOUBLE_QUOTED_ATTRIBUTE_PATTERN.sub(r"\1='\2'", match.group(0))
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logged_count = 0
+        
+        def fix_and_log_single_tag(match):
+            nonlocal logged_count
+            logged_count += 1
+            tag = match.group(0)
+            fixed_tag = fix_single_tag(match)
+            logger.debug(f"Fixed anchor tag #{logged_count}: {repr(tag[:50])} -> {repr(fixed_tag[:50])}")
+            return fixed_tag
+        
+        tag_fixer = fix_and_log_single_tag
+    else:
+        tag_fixer = fix_single_tag
     
     # Find all <a ...> opening tags and fix quotes within each one
-    result = re.sub(r'<a\s+[^>]+>', fix_single_tag, text)
+    result, anchor_count = _ANCHOR_TAG_PATTERN.subn(tag_fixer, text)
     
     if anchor_count > 0:
         logger.info(f"Fixed {anchor_count} anchor tags total")
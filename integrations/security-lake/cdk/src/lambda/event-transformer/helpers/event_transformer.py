@@ -10,8 +10,10 @@ Event Transformer for converting cloud security events
 import json
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from itertools import repeat
+from typing import Dict, List, Any, Optional, Tuple
 import boto3
 from botocore.exceptions import ClientError
 from core.event_mapper import CloudEventMapper
@@ -25,7 +27,7 @@ class CloudTrailTransformer:
     """
     
     def __init__(self, event_data_store_arn: str, region_name: str = None, logger: logging.Logger = None,
-                 channel_arn: str = None):
+                 channel_arn: str = None, max_send_workers: int = 4):
         """
         Initialize the CloudTrail transformer
         
@@ -34,12 +36,18 @@ class CloudTrailTransformer:
             region_name: AWS region name
             logger: Logger instance
             channel_arn: ARN of the CloudTrail Channel (required for put_audit_events)
+            max_send_workers: Maximum concurrent PutAuditEvents calls when sending multiple batches
         """
         self.logger = logger or logging.getLogger(__name__)
         self.event_data_store_arn = event_data_store_arn
         self.channel_arn = channel_arn
         self.event_mapper = CloudEventMapper(logger=self.logger)
         
+        # Bounded pool for independent PutAuditEvents batches - reused across warm invocations
+        # (stays within the botocore client's default pool of 10 HTTP connections)
+        self._send_pool = ThreadPoolExecutor(max_workers=max(1, min(max_send_workers, 10)),
+                                             thread_name_prefix='put-audit-events')
+        
         try:
             self.cloudtrail_data = boto3.client('cloudtrail-data', region_name=region_name)
             self.cloudtrail = boto3.client('cloudtrail', region_name=region_name)
@@ -183,132 +191,18 @@ class CloudTrailTransformer:
             total_failed = 0
             total_batches = (len(events) + batch_size - 1) // batch_size
             
-            for batch_num in range(0, len(events), batch_size):
-                batch = events[batch_num:batch_num + batch_size]
-                current_batch_number = (batch_num // batch_size) + 1
-                
-                try:
-                    # Prepare audit events for CloudTrail with detailed logging
-                    audit_events = []
-                    for i, event in enumerate(batch):
-                        try:
-                            # Events should already be in the correct format from CloudTrailAuditEvent.to_dict()
-                            audit_event = {
-                                'eventData': event.get('eventData'),
-                                'id': event.get('id', str(uuid.uuid4()))
-                            }
-                            
-                            # Add eventDataChecksum if present
-                            if event.get('eventDataChecksum'):
-                                audit_event['eventDataChecksum'] = event['eventDataChecksum']
-                            
-                            audit_events.append(audit_event)
-                            self.logger.debug(f"Prepared audit event {i+1}/{len(batch)} for CloudTrail")
-                            
-                        except Exception as prep_error:
-                            self.logger.error(
-                                f"Failed to prepare audit event {i+1} in batch {current_batch_number}: {str(prep_error)}",
-                                extra={
-                                    'prep_error': str(prep_error),
-                                    'event_id': event.get('id', 'unknown'),
-                                    'event_keys': list(event.keys()) if isinstance(event, dict) else 'not_dict'
-                                }
-                            )
-                            raise  # Re-raise to fail the batch
-                    
-                    self.logger.debug(f"Sending batch {current_batch_number} with {len(audit_events)} events to CloudTrail")
-                    
-                    # Log consolidated event summary for debugging (single-line for CloudWatch compatibility)
-                    event_summary = ', '.join(
-                        f"id={e.get('id', 'MISSING')[:8]}..." for e in audit_events[:5]
-                    )
-                    if len(audit_events) > 5:
-                        event_summary += f" (+{len(audit_events) - 5} more)"
-                    self.logger.info(f"Batch {current_batch_number} events: [{event_summary}]")
-                    
-                    # Get the channel ARN for sending events
-                    channel_arn = self._get_channel_arn()
-                    if not channel_arn:
-                        raise Exception("No valid Channel ARN available for sending events to Event Data Store")
-                    
-                    # Send batch to CloudTrail Channel (which forwards to Event Data Store)
-                    self.logger.debug(f"Sending batch to Channel ARN: {channel_arn}")
-                    response = self.cloudtrail_data.put_audit_events(
-                        auditEvents=audit_events,
-                        channelArn=channel_arn
-                    )
-                    
-                    self.logger.debug(f"CloudTrail put_audit_events response: {response}")
-                    
-                    # Process response
-                    successful = len(response.get('successful', []))
-                    failed = len(response.get('failed', []))
-                    
-                    total_successful += successful
-                    total_failed += failed
-                    
-                    self.logger.info(
-                        f"Batch {current_batch_number}/{total_batches}: {successful} successful, {failed} failed"
-                    )
-                    
-                    # Log any failures with details
-                    if response.get('failed'):
-                        for failed_event in response['failed']:
-                            # Find the original event data for the failed event
-                            failed_id = failed_event.get('id')
-                            original_event = None
-                            for original in audit_events:
-                                if original.get('id') == failed_id:
-                                    original_event = original
-                                    break
-                            
-                            if original_event:
-                                self.logger.info(f"Failed event: {original_event.get('eventData', 'N/A')}")
-                            
-                            self.logger.warning(
-                                f"Failed to send event to Event Data Store",
-                                extra={
-                                    'event_id': failed_id,
-                                    'error_code': failed_event.get('errorCode'),
-                                    'error_message': failed_event.get('errorMessage'),
-                                    'batch_number': current_batch_number
-                                }
-                            )
-                
-                except ClientError as e:
-                    total_failed += len(batch)
-                    error_code = e.response['Error']['Code']
-                    error_message = e.response['Error']['Message']
-                    self.logger.error(
-                        f"Failed to send batch {current_batch_number} to Event Data Store - {error_code}: {error_message}",
-                        extra={
-                            'batch_size': len(batch),
-                            'error_code': error_code,
-                            'error_message': error_message,
-                            'batch_number': current_batch_number,
-                            'datastore_arn': self.event_data_store_arn
-                        }
-                    )
-                
-                except Exception as e:
-                    total_failed += len(batch)
-                    import traceback
-                    
-                    # Log detailed error information
-                    self.logger.error(
-                        f"DETAILED ERROR - Batch {current_batch_number} failed: {type(e).__name__}: {str(e)}",
-                        extra={
-                            'batch_size': len(batch),
-                            'error': str(e),
-                            'error_type': type(e).__name__,
-                            'batch_number': current_batch_number,
-                            'datastore_arn': self.event_data_store_arn,
-                            'first_event_id': batch[0].get('id', 'unknown') if batch else 'no_events'
-                        }
-                    )
-                    
-                    # Always log the full traceback for debugging
-                    self.logger.error(f"FULL EXCEPTION TRACEBACK:\n{traceback.format_exc()}")
+            batches = [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
+            if len(batches) == 1:
+                batch_results = [self._send_audit_events_batch(batches[0], 1, total_batches)]
+            else:
+                # Batches are independent - issue PutAuditEvents calls concurrently (results keep batch order)
+                batch_results = list(self._send_pool.map(
+                    self._send_audit_events_batch, batches, range(1, total_batches + 1), repeat(total_batches)
+                ))
+            
+            for successful, failed in batch_results:
+                total_successful += successful
+                total_failed += failed
             
             # Final summary
             result = {
@@ -340,6 +234,141 @@ class CloudTrailTransformer:
             )
             raise
     
+    def _send_audit_events_batch(self, batch: List[Dict[str, Any]], current_batch_number: int,
+                                 total_batches: int) -> Tuple[int, int]:
+        """
+        Send a single batch of events to the CloudTrail Channel
+        
+        Args:
+            batch: Up to 100 CloudTrail formatted events
+            current_batch_number: 1-based batch number (for logging)
+            total_batches: Total number of batches in this send operation
+            
+        Returns:
+            Tuple of (successful, failed) event counts for the batch
+        """
+        try:
+            # Prepare audit events for CloudTrail with detailed logging
+            audit_events = []
+            for i, event in enumerate(batch):
+                try:
+                    # Events should already be in the correct format from CloudTrailAuditEvent.to_dict()
+                    audit_event = {
+                        'eventData': event.get('eventData'),
+                        'id': event.get('id', str(uuid.uuid4()))
+                    }
+                    
+                    # Add eventDataChecksum if present
+                    if event.get('eventDataChecksum'):
+                        audit_event['eventDataChecksum'] = event['eventDataChecksum']
+                    
+                    audit_events.append(audit_event)
+                    self.logger.debug(f"Prepared audit event {i+1}/{len(batch)} for CloudTrail")
+                    
+                except Exception as prep_error:
+                    self.logger.error(
+                        f"Failed to prepare audit event {i+1} in batch {current_batch_number}: {str(prep_error)}",
+                        extra={
+                            'prep_error': str(prep_error),
+                            'event_id': event.get('id', 'unknown'),
+                            'event_keys': list(event.keys()) if isinstance(event, dict) else 'not_dict'
+                        }
+                    )
+                    raise  # Re-raise to fail the batch
+            
+            self.logger.debug(f"Sending batch {current_batch_number} with {len(audit_events)} events to CloudTrail")
+            
+            # Log consolidated event summary for debugging (single-line for CloudWatch compatibility)
+            event_summary = ', '.join(
+                f"id={e.get('id', 'MISSING')[:8]}..." for e in audit_events[:5]
+            )
+            if len(audit_events) > 5:
+                event_summary += f" (+{len(audit_events) - 5} more)"
+            self.logger.info(f"Batch {current_batch_number} events: [{event_summary}]")
+            
+            # Get the channel ARN for sending events
+            channel_arn = self._get_channel_arn()
+            if not channel_arn:
+                raise Exception("No valid Channel ARN available for sending events to Event Data Store")
+            
+            # Send batch to CloudTrail Channel (which forwards to Event Data Store)
+            self.logger.debug(f"Sending batch to Channel ARN: {channel_arn}")
+            response = self.cloudtrail_data.put_audit_events(
+                auditEvents=audit_events,
+                channelArn=channel_arn
+            )
+            
+            self.logger.debug(f"CloudTrail put_audit_events response: {response}")
+            
+            # Process response
+            successful = len(response.get('successful', []))
+            failed = len(response.get('failed', []))
+            
+            self.logger.info(
+                f"Batch {current_batch_number}/{total_batches}: {successful} successful, {failed} failed"
+            )
+            
+            # Log any failures with details
+            if response.get('failed'):
+                for failed_event in response['failed']:
+                    # Find the original event data for the failed event
+                    failed_id = failed_event.get('id')
+                    original_event = None
+                    for original in audit_events:
+                        if original.get('id') == failed_id:
+                            original_event = original
+                            break
+                    
+                    if original_event:
+                        self.logger.info(f"Failed event: {original_event.get('eventData', 'N/A')}")
+                    
+                    self.logger.warning(
+                        f"Failed to send event to Event Data Store",
+                        extra={
+                            'event_id': failed_id,
+                            'error_code': failed_event.get('errorCode'),
+                            'error_message': failed_event.get('errorMessage'),
+                            'batch_number': current_batch_number
+                        }
+                    )
+            
+            return successful, failed
+        
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            self.logger.error(
+                f"Failed to send batch {current_batch_number} to Event Data Store - {error_code}: {error_message}",
+                extra={
+                    'batch_size': len(batch),
+                    'error_code': error_code,
+                    'error_message': error_message,
+                    'batch_number': current_batch_number,
+                    'datastore_arn': self.event_data_store_arn
+                }
+            )
+            return 0, len(batch)
+        
+        except Exception as e:
+            import traceback
+            
+            # Log detailed error information
+            self.logger.error(
+                f"DETAILED ERROR - Batch {current_batch_number} failed: {type(e).__name__}: {str(e)}",
+                extra={
+                    'batch_size': len(batch),
+                    'error': str(e),
+                    'error_type': type(e).__name__,
+                    'batch_number': current_batch_number,
+                    'datastore_arn': self.event_data_store_arn,
+                    'first_event_id': batch[0].get('id', 'unknown') if batch else 'no_events'
+                }
+            )
+            
+            # Always log the full traceback for debugging
+            self.logger.error(f"FULL EXCEPTION TRACEBACK:\n{traceback.format_exc()}")
+            return 0, len(batch)
+    
     def _get_channel_arn(self) -> Optional[str]:
         """
         Get CloudTrail Channel ARN from instance variable or environment variables.
@@ -20,6 +20,22 @@ import re
 import logging
 from typing import Dict, Any, Optional, Tuple
 
+# Malformation patterns - compiled once at import
+_DOUBLE_OPEN_BRACE_PATTERN = re.compile(r'("event_data":\s*){{')
+_ANCHOR_TAG_PATTERN = re.compile(r'<a\s+[^>]+>')
+_DOUBLE_QUOTED_ATTRIBUTE_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+# JSON escapes for control characters (0x00-0x1F): short forms where JSON defines one, \uXXXX otherwise
+_CONTROL_CHAR_ESCAPES = {chr(i): f'\\u{i:04x}' for i in range(0x20)}
+_CONTROL_CHAR_ESCAPES.update({'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'})
+
+_CONTROL_CHAR_PATTERN = re.compile(r'[\x00-\x1f]')
+# A backslash escape outside a string, or a whole string literal (unterminated at end of text included)
+_STRING_TOKEN_PATTERN = re.compile(r'\\.|"[^"\\]*(?:\\.[^"\\]*)*(?:"|\\?\Z)', re.DOTALL)
+# Inside a string literal: an escape sequence (left as-is) or a bare control character
+_STRING_CONTROL_CHAR_PATTERN = re.compile(r'\\.|([\x00-\x1f])', re.DOTALL)
+_ESCAPED_CONTROL_CHAR_PATTERN = re.compile(r'\\[\x00-\x1f]')
+
 
 def fix_json(json_string: str, logger: Optional[logging.Logger] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
     """
@@ -114,14 +130,12 @@ def _fix_double_braces(text: str, logger: logging.Logger) -> str:
     Returns:
         Fixed JSON string
     """
-    # Check if we have double opening braces
-    has_double_open = bool(re.search(r'("event_data":\s*){{', text))
+    # Fix opening double braces: "event_data": {{ -> "event_data": {
+    fixed, double_open_count = _DOUBLE_OPEN_BRACE_PATTERN.subn(r'\1{', text)
     
-    if not has_double_open:
+    if not double_open_count:
         return text
     
-    # Fix opening double braces: "event_data": {{ -> "event_data": {
-    fixed = re.sub(r'("event_data":\s*){{', r'\1{', text)
     logger.debug("Fixed double opening braces")
     
     # Balance braces by counting total opening and closing braces
@@ -199,49 +213,42 @@ def _fix_control_characters(text: str, logger: logging.Logger) -> str:
     Returns:
         Fixed JSON string with control characters properly escaped
     """
-    # Control character mapping for JSON escaping
-    control_char_map = {
-        '\n': '\\n',
-        '\r': '\\r',
-        '\t': '\\t',
-        '\b': '\\b',
-        '\f': '\\f',
-    }
-    
-    # Additional control characters (0x00-0x1F) not covered above
-    for i in range(0x20):
-        char = chr(i)
-        if char not in control_char_map:
-            # Escape as unicode for other control characters
-            control_char_map[char] = f'\\u{i:04x}'
-    
-    result = []
-    in_string = False
-    escape_next = False
+    # Nothing to escape - skip the scan entirely (control characters are never printable,
+    # and str.isprintable() is a cheaper C scan than the regex search)
+    if text.isprintable() or not _CONTROL_CHAR_PATTERN.search(text):
+        return text
+    
     fixed_count = 0
     
-    for i, char in enumerate(text):
-        # Track if we're inside a JSON string value
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            result.append(char)
-            escape_next = False
-        elif char == '\\' and not escape_next:
-            escape_next = True
-            result.append(char)
-        elif in_string and char in control_char_map and not escape_next:
-            # Found an unescaped control character in a string value
-            result.append(control_char_map[char])
-            fixed_count += 1
-            escape_next = False
-        else:
-            result.append(char)
-            escape_next = False
+    def escape_control_char(match):
+        nonlocal fixed_count
+        char = match.group(1)
+        if char is None:
+            return match.group(0)
+        fixed_count += 1
+        return _CONTROL_CHAR_ESCAPES[char]
+    
+    def fix_string_token(match):
+        nonlocal fixed_count
+        token = match.group(0)
+        # Escapes outside strings and strings without control characters pass through
+        if token[0] != '"' or not _CONTROL_CHAR_PATTERN.search(token):
+            return token
+        if _ESCAPED_CONTROL_CHAR_PATTERN.search(token):
+            # A control character follows a backslash - leave those escaped ones untouched
+            return _STRING_CONTROL_CHAR_PATTERN.sub(escape_control_char, token)
+        found = _CONTROL_CHAR_PATTERN.findall(token)
+        fixed_count += len(found)
+        for char in set(found):
+            token = token.replace(char, _CONTROL_CHAR_ESCAPES[char])
+        return token
+    
+    result = _STRING_TOKEN_PATTERN.sub(fix_string_token, text)
     
     if fixed_count > 0:
         logger.info(f"Escaped {fixed_count} unescaped control characters in JSON strings")
     
-    return ''.join(result)
+    return result
 
 
 def _fix_html_anchor_quotes(text: str, logger: logging.Logger) -> str:
@@ -267,12 +274,12 @@ def _fix_html_anchor_quotes(text: str, logger: logging.Logger) -> str:
         anchor_count += 1
         tag = match.group(0)
         # Within this isolated tag, convert all attribute="value" to attribute='value'
-        fixed_tag = re.sub(r'(\w+)="([^"]*)"', r"\1='\2'", tag)
+        fixed_tag = _DOUBLE_QUOTED_ATTRIBUTE_PATTERN.sub(r"\1='\2'", tag)
         logger.debug(f"Fixed anchor tag #{anchor_count}: {repr(tag[:50])} -> {repr(fixed_tag[:50])}")
         return fixed_tag
     
     # Find all <a ...> opening tags and fix quotes within each one
-    result = re.sub(r'<a\s+[^>]+>', fix_single_tag, text)
+    result = _ANCHOR_TAG_PATTERN.sub(fix_single_tag, text)
     
     if anchor_count > 0:
         logger.info(f"Fixed {anchor_count} anchor tags total")